@@ -1,21 +1,61 @@
+import argparse
+import contextlib
 import sys
 
 from PyQt5.QtWidgets import QApplication
 
+import ms_instrumentation as instrumentation
 from ms_controller import MinesweeperController
+from ms_latency import LatencyTracker
+from ms_statistics import DEFAULT_PATH, StatisticsStore
 
 if __name__ == "__main__":
-    if len(sys.argv) >= 2 and sys.argv[1] in ["-h", "--help"]:
-        print("You can specify the number of width and height of the field and the number of mines to place:")
-        print("python minesweeper.py <width> <height> <number of mines>")
-        sys.exit(-1)
+    parser = argparse.ArgumentParser(
+        description="You can specify the number of width and height of the field and the number of mines to place.",
+        usage="python minesweeper.py [options] <width> <height> <number of mines>")
+    parser.add_argument("size", nargs="*", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="Record metrics and write them to a JSON file on exit")
+    parser.add_argument("--metrics-port", metavar="PORT", type=int,
+                        help="Record metrics and serve them in the Prometheus text format on localhost:PORT")
+    parser.add_argument("--profile", metavar="FILE", help="Run the whole session in cProfile and write the stats file")
+    parser.add_argument("--latency", action="store_true",
+                        help="Display the click-to-paint latency percentiles in the status bar")
+    parser.add_argument("--latency-json", metavar="FILE",
+                        help="Measure the click-to-paint latency and write the percentiles to a JSON file on exit")
+    parser.add_argument("--statistics", metavar="FILE", default=DEFAULT_PATH,
+                        help=f"The database to record finished games in (default: {DEFAULT_PATH})")
+    parser.add_argument("--no-statistics", action="store_true", help="Don't record finished games")
+    args = parser.parse_args()
 
-    app = QApplication([])
+    # The GUI finishes a game every few minutes at most, so every game is written immediately
+    statistics = None if args.no_statistics else StatisticsStore(args.statistics, batch_size=1)
 
-    if len(sys.argv) >= 4:
-        window = MinesweeperController(columns=int(sys.argv[1]), rows=int(sys.argv[2]), mines=int(sys.argv[3]))
-    else:
-        window = MinesweeperController()
+    latency = LatencyTracker() if args.latency or args.latency_json else None
 
-    window.show()
-    sys.exit(app.exec())
+    if args.metrics_json or args.metrics_port:
+        instrumentation.enable()
+    if args.metrics_port:
+        instrumentation.serve(args.metrics_port)
+
+    with instrumentation.profile_session(args.profile) if args.profile else contextlib.nullcontext():
+        app = QApplication([])
+
+        if len(args.size) >= 3:
+            window = MinesweeperController(columns=args.size[0], rows=args.size[1], mines=args.size[2],
+                                           latency=latency, show_latency=args.latency, statistics=statistics)
+        else:
+            window = MinesweeperController(latency=latency, show_latency=args.latency, statistics=statistics)
+
+        window.show()
+        exit_code = app.exec()
+
+    if args.metrics_json:
+        instrumentation.write_json(args.metrics_json)
+
+    if statistics is not None:
+        statistics.close()
+    if args.latency_json:
+        latency.write_json(args.latency_json)
+
+    sys.exit(exit_code)
@@ -0,0 +1,329 @@
+from PyQt5.QtCore import QRect, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter
+from PyQt5.QtWidgets import QAbstractScrollArea, QStyle, QStyleOptionButton
+
+from ms_topology import Topology
+
+
+class BoardView(QAbstractScrollArea):
+    """A scrollable, zoomable view of the game board
+
+    Instead of a widget per field, the view only keeps the display state of every field and paints the fields inside
+    the visible part of the viewport. Scrolling moves the pixels that are already painted and only paints the fields
+    that have become visible, so boards with a million fields scroll as smoothly as small ones.
+
+    Hold Ctrl and use the mouse wheel (or press Ctrl and +, - or 0) to zoom.
+    """
+
+    # Emitted with the position (width * y + x) of a field that has been left-clicked
+    clicked = pyqtSignal(int)
+    # Emitted with the position (width * y + x) of a field that has been right-clicked
+    right_clicked = pyqtSignal(int)
+    # Emitted after the viewport has been painted
+    painted = pyqtSignal()
+
+    # Display states of the fields (0 to 8 are uncovered fields with that number of adjacent mines)
+    COVERED = 9
+    MINE_TAGGED = 10  # Tagged by the player as "mine"
+    MINE_POSSIBLE = 11  # Tagged by the player as "possibly a mine"
+    MINE_MISSED = 12  # A mine the player hasn't found until the game ended
+    MINE_FOUND = 13  # A mine the player had tagged before the game ended
+
+    # The text and the background and text colors of the display states
+    TEXT = {MINE_TAGGED: "!", MINE_POSSIBLE: "?", MINE_MISSED: "✕", MINE_FOUND: "✕"}
+    BACKGROUND = {MINE_TAGGED: "yellow", MINE_POSSIBLE: "blue", MINE_MISSED: "red", MINE_FOUND: "green"}
+    FOREGROUND = {MINE_TAGGED: "black", MINE_POSSIBLE: "white", MINE_MISSED: "black", MINE_FOUND: "black"}
+
+    # Font colors for the number of adjacent mines - these are the original Minesweeper colors
+    NUMBER_COLORS = [
+        "black",    # Fields with 0 bordering mines don't have any text
+        "#0200fd",  # 1 mine
+        "#017e00",  # 2 mines
+        "red",      # 3 mines
+        "#010180",  # 4 mines
+        "#7f0300",  # 5 mines
+        "#008180",  # 6 mines
+        "black",    # 7 mines
+        "#808080",  # 8 mines
+    ]
+
+    # The size of a field and the distance between the top left corners of two fields at a zoom of 1
+    FIELD_SIZE = 40
+    FIELD_PITCH = 45
+    FONT_SIZE = 17
+
+    # Below this field size, covered fields are painted as plain rectangles instead of native buttons
+    MIN_BUTTON_SIZE = 20
+
+    MIN_ZOOM = 0.1
+    MAX_ZOOM = 3.0
+
+    def __init__(self, parent=None):
+        """Create a new, empty BoardView. Use set_board() to display a game board."""
+        super().__init__(parent=parent)
+
+        self.columns = 0
+        self.rows = 0
+        self.hexagonal = False
+        self.states = bytearray()
+        self.finished = False  # Covered fields are painted disabled once the game has ended
+        self.zoom = 1.0
+
+        self.__pressed = None  # The position of the field the left mouse button has been pressed on
+
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    def set_board(self, columns: int, rows: int, topology: str = Topology.SQUARE) -> None:
+        """Display a new game board with all fields covered
+
+        :param columns: The number of columns on the game board
+        :param rows: The number of rows on the game board
+        :param topology: The topology of the game board. On hexagonal boards, odd rows are shifted right by half a
+            field. Default is Topology.SQUARE.
+        """
+        self.columns = columns
+        self.rows = rows
+        self.hexagonal = topology == Topology.HEXAGONAL
+        self.states = bytearray([BoardView.COVERED]) * (columns * rows)
+        self.finished = False
+
+        self.horizontalScrollBar().setValue(0)
+        self.verticalScrollBar().setValue(0)
+        self.__update_scroll_bars()
+        self.viewport().update()
+
+    def set_field(self, x: int, y: int, state: int) -> None:
+        """Change the display state of a single field
+
+        :param x: The x coordinate (column) of the field (the leftmost column has the x coordinate 0).
+        :param y: The y coordinate (row) of the field (the uppermost row has the y coordinate 0).
+        :param state: The display state, the number of adjacent mines or one of the BoardView constants
+        """
+        self.states[self.columns * y + x] = state
+        self.viewport().update(self.field_rect(x, y))
+
+    def set_fields(self, fields: list) -> None:
+        """Change the display state of many fields, e.g. after uncovering an area
+
+        :param fields: A list of (x, y, display state) tuples
+        """
+        columns = self.columns
+        for x, y, state in fields:
+            self.states[columns * y + x] = state
+
+        if len(fields) <= 64:
+            for x, y, state in fields:
+                self.viewport().update(self.field_rect(x, y))
+        else:
+            # Repainting the visible part is cheaper than collecting a region from thousands of rectangles
+            self.viewport().update()
+
+    def set_finished(self, finished: bool = True) -> None:
+        """Paint covered fields as disabled (or enabled again)
+
+        :param finished: Whether the game has ended. Default is True.
+        """
+        self.finished = finished
+        self.viewport().update()
+
+    def set_zoom(self, zoom: float, anchor=None) -> None:
+        """Change the zoom, keeping the point of the board under the anchor in place
+
+        :param zoom: The new zoom (1 is the original field size). It is limited to MIN_ZOOM to MAX_ZOOM.
+        :param anchor: The point of the viewport that should stay in place (a QPoint). Default is None (the center of
+            the viewport).
+        """
+        zoom = min(BoardView.MAX_ZOOM, max(BoardView.MIN_ZOOM, zoom))
+        if anchor is None:
+            anchor = self.viewport().rect().center()
+
+        old_pitch = self.pitch()
+        board_x = (anchor.x() + self.horizontalScrollBar().value()) / old_pitch
+        board_y = (anchor.y() + self.verticalScrollBar().value()) / old_pitch
+
+        self.zoom = zoom
+        self.__update_scroll_bars()
+        self.horizontalScrollBar().setValue(round(board_x * self.pitch() - anchor.x()))
+        self.verticalScrollBar().setValue(round(board_y * self.pitch() - anchor.y()))
+        self.viewport().update()
+
+    def pitch(self) -> int:
+        """Get the distance between the top left corners of two adjacent fields at the current zoom
+
+        :return: The distance in pixels
+        """
+        return max(2, round(BoardView.FIELD_PITCH * self.zoom))
+
+    def field_size(self) -> int:
+        """Get the size of a field at the current zoom
+
+        :return: The width and height of a field in pixels
+        """
+        return max(1, self.pitch() - max(1, round((BoardView.FIELD_PITCH - BoardView.FIELD_SIZE) * self.zoom)))
+
+    def board_size(self) -> tuple:
+        """Get the size of the whole game board at the current zoom
+
+        :return: A tuple (width, height) in pixels
+        """
+        pitch = self.pitch()
+        return self.columns * pitch + (pitch // 2 if self.hexagonal else 0), self.rows * pitch
+
+    def field_rect(self, x: int, y: int) -> QRect:
+        """Get the rectangle a field is painted in, in viewport coordinates
+
+        :param x: The x coordinate (column) of the field (the leftmost column has the x coordinate 0).
+        :param y: The y coordinate (row) of the field (the uppermost row has the y coordinate 0).
+        :return: The rectangle
+        """
+        pitch = self.pitch()
+        left = x * pitch + self.__row_shift(y) - self.horizontalScrollBar().value()
+        top = y * pitch - self.verticalScrollBar().value()
+        return QRect(left, top, self.field_size(), self.field_size())
+
+    def field_at(self, point):
+        """Get the field at a point of the viewport
+
+        :param point: The point in viewport coordinates (a QPoint)
+        :return: The position (width * y + x) of the field, or None if there is no field at the point
+        """
+        pitch = self.pitch()
+        board_y = point.y() + self.verticalScrollBar().value()
+        y = board_y // pitch
+        if not 0 <= y < self.rows:
+            return None
+
+        board_x = point.x() + self.horizontalScrollBar().value() - self.__row_shift(y)
+        x = board_x // pitch
+        if not 0 <= x < self.columns:
+            return None
+
+        # Points in the gaps between the fields don't belong to any field
+        if board_x % pitch >= self.field_size() or board_y % pitch >= self.field_size():
+            return None
+
+        return self.columns * y + x
+
+    def field_range(self, area: QRect) -> tuple:
+        """Get the range of fields that may intersect an area of the viewport
+
+        :param area: The area in viewport coordinates
+        :return: A tuple (first column, last column, first row, last row). The range is empty (e.g. the last column is
+            lower than the first) if the area is outside of the board.
+        """
+        pitch = self.pitch()
+        h_value = self.horizontalScrollBar().value()
+        v_value = self.verticalScrollBar().value()
+
+        # On hexagonal boards, one more column on the left can reach into the area because of the shifted rows
+        first_column = max(0, (area.left() + h_value) // pitch - (1 if self.hexagonal else 0))
+        last_column = min(self.columns - 1, (area.right() + h_value) // pitch)
+        first_row = max(0, (area.top() + v_value) // pitch)
+        last_row = min(self.rows - 1, (area.bottom() + v_value) // pitch)
+        return first_column, last_column, first_row, last_row
+
+    def paintEvent(self, event):
+        """Paint the fields inside the area that needs to be repainted, and nothing else"""
+        painter = QPainter(self.viewport())
+        pitch = self.pitch()
+        size = self.field_size()
+        h_value = self.horizontalScrollBar().value()
+        v_value = self.verticalScrollBar().value()
+        first_column, last_column, first_row, last_row = self.field_range(event.rect())
+
+        font = QFont()
+        font.setBold(True)
+        font.setPixelSize(max(1, round(BoardView.FONT_SIZE * self.zoom)))
+        painter.setFont(font)
+
+        native = size >= BoardView.MIN_BUTTON_SIZE
+        button = QStyleOptionButton()
+        button.state = QStyle.State_Raised | (QStyle.State_None if self.finished else QStyle.State_Enabled)
+        covered_color = self.palette().button()
+
+        for y in range(first_row, last_row + 1):
+            top = y * pitch - v_value
+            left_offset = self.__row_shift(y) - h_value
+            row = self.states[self.columns * y + first_column:self.columns * y + last_column + 1]
+
+            for x, state in enumerate(row, first_column):
+                rect = QRect(x * pitch + left_offset, top, size, size)
+
+                if state == BoardView.COVERED:
+                    if native:
+                        button.rect = rect
+                        self.style().drawControl(QStyle.CE_PushButton, button, painter, self)
+                    else:
+                        painter.fillRect(rect, covered_color)
+                elif state <= 8:
+                    if state > 0:
+                        painter.setPen(QColor(BoardView.NUMBER_COLORS[state]))
+                        painter.drawText(rect, Qt.AlignCenter, str(state))
+                else:
+                    painter.fillRect(rect, QColor(BoardView.BACKGROUND[state]))
+                    painter.setPen(QColor(BoardView.FOREGROUND[state]))
+                    painter.drawText(rect, Qt.AlignCenter, BoardView.TEXT[state])
+
+        painter.end()
+        self.painted.emit()
+
+    def scrollContentsBy(self, dx, dy):
+        # Move the pixels that are already painted, so only the newly visible fields need to be painted
+        self.viewport().scroll(dx, dy)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.__update_scroll_bars()
+
+    def mousePressEvent(self, event):
+        position = self.field_at(event.pos())
+        if event.button() == Qt.LeftButton:
+            self.__pressed = position
+        elif event.button() == Qt.RightButton and position is not None:
+            self.right_clicked.emit(position)
+
+    def mouseReleaseEvent(self, event):
+        # Like a button, a field is only clicked if the mouse is released on the field it has been pressed on
+        if event.button() == Qt.LeftButton:
+            position = self.field_at(event.pos())
+            if position is not None and position == self.__pressed:
+                self.clicked.emit(position)
+            self.__pressed = None
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            steps = event.angleDelta().y() / 120
+            self.set_zoom(self.zoom * 1.25 ** steps, anchor=event.pos())
+        else:
+            super().wheelEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier and event.key() in (Qt.Key_Plus, Qt.Key_Equal):
+            self.set_zoom(self.zoom * 1.25)
+        elif event.modifiers() & Qt.ControlModifier and event.key() == Qt.Key_Minus:
+            self.set_zoom(self.zoom / 1.25)
+        elif event.modifiers() & Qt.ControlModifier and event.key() == Qt.Key_0:
+            self.set_zoom(1.0)
+        else:
+            super().keyPressEvent(event)
+
+    def __row_shift(self, y: int) -> int:
+        """Get the horizontal shift of a row, which is half a field for odd rows of a hexagonal board
+
+        :param y: The row
+        :return: The shift in pixels
+        """
+        return self.pitch() // 2 if self.hexagonal and y % 2 else 0
+
+    def __update_scroll_bars(self) -> None:
+        """Update the ranges of the scroll bars to the size of the board and the viewport"""
+        width, height = self.board_size()
+        viewport = self.viewport().size()
+        pitch = self.pitch()
+
+        self.horizontalScrollBar().setRange(0, max(0, width - viewport.width()))
+        self.horizontalScrollBar().setPageStep(viewport.width())
+        self.horizontalScrollBar().setSingleStep(pitch)
+        self.verticalScrollBar().setRange(0, max(0, height - viewport.height()))
+        self.verticalScrollBar().setPageStep(viewport.height())
+        self.verticalScrollBar().setSingleStep(pitch)
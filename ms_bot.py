@@ -0,0 +1,298 @@
+"""A line-oriented stdin/stdout protocol for playing Minesweeper without the GUI
+
+External programs (e.g. bots in any language) can drive a MinesweeperModel by writing commands to the standard input
+of this program and reading the responses from its standard output. Each command produces exactly one response line.
+
+Commands:
+
+- ``new W H M [SEED]``: Start a new game with W columns, H rows and M mines. W and H can be 1 to 1000, M 0 to W*H.
+  Responds with ``ok``.
+- ``open X Y``: Uncover a field (and the area around it, if it has no adjacent mines).
+- ``chord X Y``: Uncover all untagged fields around an uncovered field whose mines have all been tagged.
+- ``flag X Y``: Switch the tagging of a field. Responds with ``ok STATE`` (the new field state, see ms_model.Field).
+- ``state``: Responds with the game status followed by the board, one string per row, separated by ``/``. Covered
+  fields are ``#``, tagged fields ``!``, possibly tagged fields ``?`` and uncovered fields the number of adjacent mines.
+- ``quit``: Stop the program. This is the only command without a response.
+
+``open`` and ``chord`` respond with the game status (``ok``, ``won`` or ``lost``), the number of uncovered fields and
+one ``x,y,n`` token per uncovered field (n being the number of adjacent mines). If a mine is found, the fields a
+``chord`` uncovered before the mine are listed as well, e.g. ``lost 0`` or ``lost 2 3,4,1 4,4,2``. Invalid commands
+respond with ``err <message>``.
+
+Several commands can be sent on a single line, separated by ``;``. Their responses are written at once, so a bot can
+pipeline a whole batch of moves without waiting for each response. The output is flushed after every input line. A
+``quit`` in a batch stops the program after the responses to the commands before it have been written.
+
+With ``--statistics FILE``, every finished game is recorded in a statistics database (see ms_statistics).
+``--metrics-json FILE`` and ``--metrics-port PORT`` record metrics about the game logic (see ms_instrumentation).
+"""
+
+import argparse
+import sys
+import time
+
+import ms_instrumentation as instrumentation
+from ms_model import *
+from ms_statistics import StatisticsStore
+
+# The maximum width and height of a game board, the same as in the custom game dialog. Larger boards would let a
+# single command exhaust the memory of the whole session.
+MAX_SIZE = 1000
+
+# Characters for the field states in the response to the "state" command
+STATE_CHARS = {Field.COVERED: "#", Field.MINE_TAGGED: "!", Field.MINE_POSSIBLE: "?"}
+
+
+class BotSession:
+    """A session of games played through the bot protocol
+
+    A single session can play any number of games in a row, so a bot does not need to start a new process per game.
+    """
+
+    def __init__(self, statistics: StatisticsStore = None):
+        """Create a new BotSession without a running game. A game has to be started with the "new" command.
+
+        :param statistics: A StatisticsStore to record every finished game in. Default is None (no statistics).
+        """
+        self.model = None
+        self.status = "ok"  # "ok" while the game is running, "won" or "lost" after it has ended
+        self.counts = {}  # The number of adjacent mines of every uncovered field, by (x, y)
+        self.statistics = statistics
+        self.moves = 0  # The number of accepted moves in the current game
+        self.start_time = 0.0
+        self.quit = False  # Set when the "quit" command has been received
+
+        # The handler of every command with the minimum and maximum number of arguments
+        self.commands = {
+            "new": (self.new, 3, 4),
+            "open": (self.open, 2, 2),
+            "chord": (self.chord, 2, 2),
+            "flag": (self.flag, 2, 2),
+            "state": (self.state, 0, 0),
+        }
+
+    def handle_line(self, line: str) -> list:
+        """Execute all commands on a line of input
+
+        Commands after a "quit" command are not executed.
+
+        :param line: A line containing one or more commands, separated by ";"
+        :return: A list with one response string per executed command (except "quit")
+        """
+        responses = []
+        for command in line.split(";"):
+            if command.strip() == "quit":
+                self.quit = True
+                break
+            responses.append(self.handle(command))
+        return responses
+
+    def handle(self, command: str) -> str:
+        """Execute a single command
+
+        :param command: The command, e.g. "open 3 4"
+        :return: The response to the command
+        """
+        args = command.split()
+        if not args:
+            return "err empty command"
+
+        if args[0] not in self.commands:
+            return f"err unknown command {args[0]}"
+
+        handler, min_args, max_args = self.commands[args[0]]
+        if not min_args <= len(args) - 1 <= max_args:
+            expected = min_args if min_args == max_args else f"{min_args} to {max_args}"
+            return f"err {args[0]} takes {expected} arguments"
+
+        try:
+            return handler(*map(int, args[1:]))
+        except ValueError as e:
+            return f"err {e}"
+
+    def new(self, width: int, height: int, n_mines: int, seed: int = None) -> str:
+        """Start a new game
+
+        :param width: The width (number of columns) of the game board
+        :param height: The height (number of rows) of the game board
+        :param n_mines: The number of mines to hide on the game board
+        :param seed: The seed for placing the mines. Default is None (a random board).
+        :return: The response "ok"
+        :raises ValueError: If the dimensions or the number of mines are out of range
+        """
+        if not (1 <= width <= MAX_SIZE and 1 <= height <= MAX_SIZE):
+            raise ValueError(f"width and height must be between 1 and {MAX_SIZE}")
+        if not 0 <= n_mines <= width * height:
+            raise ValueError(f"number of mines must be between 0 and {width * height}")
+
+        self.model = MinesweeperModel(width=width, height=height, n_mines=n_mines, seed=seed)
+        self.status = "ok"
+        self.counts = {}
+        self.moves = 0
+        self.start_time = time.monotonic()
+        return "ok"
+
+    def open(self, x: int, y: int) -> str:
+        """Uncover a field and the area around it
+
+        :param x: The x coordinate (column) of the field
+        :param y: The y coordinate (row) of the field
+        :return: The game status, the number of uncovered fields and the uncovered fields
+        """
+        return self.__reveal("uncover_area", x, y)
+
+    def chord(self, x: int, y: int) -> str:
+        """Uncover the untagged fields around an uncovered field
+
+        :param x: The x coordinate (column) of the field
+        :param y: The y coordinate (row) of the field
+        :return: The game status, the number of uncovered fields and the uncovered fields
+        """
+        return self.__reveal("chord", x, y)
+
+    def flag(self, x: int, y: int) -> str:
+        """Switch the tagging of a field
+
+        :param x: The x coordinate (column) of the field
+        :param y: The y coordinate (row) of the field
+        :return: "ok" and the new field state
+        """
+        self.__check_running()
+        self.__check_bounds(x, y)
+
+        try:
+            state = self.model.switch_tagging(x, y)
+        except AlreadyUncoveredError:
+            return "err field already uncovered"
+
+        self.moves += 1
+        return f"ok {state}"
+
+    def state(self) -> str:
+        """Describe the whole game board
+
+        :return: The game status and the game board, one string per row
+        """
+        if self.model is None:
+            raise ValueError("no game running")
+
+        model = self.model
+        rows = []
+        for y in range(model.height):
+            row = []
+            for x in range(model.width):
+                state = model.field_state(x, y)
+                row.append(str(self.counts[(x, y)]) if state == Field.UNCOVERED else STATE_CHARS[state])
+            rows.append("".join(row))
+
+        return f"{self.status} {'/'.join(rows)}"
+
+    def __reveal(self, method: str, x: int, y: int) -> str:
+        """Uncover fields using a method of the model and describe the result
+
+        :param method: The name of the model method, either "uncover_area" or "chord"
+        :param x: The x coordinate (column) of the field
+        :param y: The y coordinate (row) of the field
+        :return: The game status, the number of uncovered fields and the uncovered fields
+        """
+        self.__check_running()
+        self.__check_bounds(x, y)
+
+        try:
+            uncovered = getattr(self.model, method)(x, y)
+        except AlreadyUncoveredError:
+            return "err field already uncovered"
+        except FieldTaggedError:
+            return "err field tagged"
+        except MineFound as e:
+            # A chord may have uncovered some fields before finding the mine
+            uncovered = e.uncovered
+            self.status = "lost"
+
+        # Only moves that have been accepted are counted for the statistics. A chord without an effect (e.g. around a
+        # field whose mines haven't all been tagged) doesn't count either.
+        if uncovered or self.status == "lost":
+            self.moves += 1
+
+        counts = self.counts
+        tokens = []
+        for field_x, field_y, n in uncovered:
+            counts[(field_x, field_y)] = n
+            tokens.append(f"{field_x},{field_y},{n}")
+
+        if self.status == "lost":
+            self.__record()
+        elif self.model.won():
+            self.status = "won"
+            self.__record()
+
+        return f"{self.status} {len(uncovered)} {' '.join(tokens)}".rstrip()
+
+    def __record(self) -> None:
+        """Record the finished game in the statistics, if a StatisticsStore has been given"""
+        if self.statistics is not None:
+            model = self.model
+            self.statistics.record(model.width, model.height, model.n_mines, won=self.status == "won",
+                                   duration=time.monotonic() - self.start_time, clicks=self.moves,
+                                   three_bv=model.three_bv(), seed=model.seed, topology=model.topology)
+
+    def __check_running(self) -> None:
+        """Make sure moves are possible
+
+        :raises ValueError: If no game has been started, or if the game has ended already
+        """
+        if self.model is None:
+            raise ValueError("no game running")
+        if self.status != "ok":
+            raise ValueError("game over")
+
+    def __check_bounds(self, x: int, y: int) -> None:
+        """Make sure the coordinates are on the game board
+
+        :raises ValueError: If the coordinates are outside of the game board bounds
+        """
+        if not (0 <= x < self.model.width and 0 <= y < self.model.height):
+            raise ValueError(f"illegal coordinates {x} {y}")
+
+
+def serve(stdin=sys.stdin, stdout=sys.stdout, statistics: StatisticsStore = None) -> None:
+    """Read commands from stdin and write the responses to stdout until the input ends or "quit" is received
+
+    :param stdin: The stream to read commands from. Default is sys.stdin.
+    :param stdout: The stream to write responses to. Default is sys.stdout.
+    :param statistics: A StatisticsStore to record every finished game in. Default is None (no statistics).
+    """
+    session = BotSession(statistics=statistics)
+
+    for line in stdin:
+        responses = session.handle_line(line)
+        if responses:
+            stdout.write("\n".join(responses) + "\n")
+            stdout.flush()
+
+        if session.quit:
+            break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Minesweeper through a line-oriented protocol on stdin/stdout")
+    parser.add_argument("--statistics", metavar="FILE", help="Record every finished game in a statistics database")
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="Record metrics and write them to a JSON file when the input ends")
+    parser.add_argument("--metrics-port", metavar="PORT", type=int,
+                        help="Record metrics and serve them in the Prometheus text format on localhost:PORT")
+    args = parser.parse_args()
+
+    if args.metrics_json or args.metrics_port:
+        instrumentation.enable()
+    if args.metrics_port:
+        instrumentation.serve(args.metrics_port)
+
+    if args.statistics:
+        with StatisticsStore(args.statistics) as store:
+            serve(statistics=store)
+    else:
+        serve()
+
+    if args.metrics_json:
+        instrumentation.write_json(args.metrics_json)
@@ -1,11 +1,17 @@
+import random
 import time
 
-from PyQt5.QtCore import QSignalMapper, Qt
-from PyQt5.QtWidgets import QDialog, QGridLayout, QLabel, QMainWindow, QMessageBox, QPushButton, QSizePolicy
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication, QDialog, QLabel, QMainWindow, QMessageBox, QTableWidgetItem
 
+import ms_instrumentation as instrumentation
+from ms_board_view import BoardView
+from ms_latency import LatencyTracker
 from ms_window import Ui_MainWindow
 from ms_model import *
 from ms_custom_game_dialog import Ui_Dialog
+from ms_statistics import StatisticsStore
+from ms_statistics_dialog import Ui_StatisticsDialog
 
 
 class CustomGameDialog(QDialog):
@@ -20,37 +26,47 @@ class CustomGameDialog(QDialog):
         self.view.buttonBox.rejected.connect(self.reject)
 
 
+class StatisticsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+
+        self.view = Ui_StatisticsDialog()
+        self.view.setupUi(self)
+
+        self.setModal(True)
+        self.view.buttonBox.rejected.connect(self.reject)
+
+    def load(self, statistics: StatisticsStore) -> None:
+        """Fill the table with the summary of every game configuration
+
+        :param statistics: The StatisticsStore to read the summary from
+        """
+        summary = statistics.summary()
+        self.view.table.setRowCount(len(summary))
+
+        for row, (width, height, mines, topology, games, wins, best_time) in enumerate(summary):
+            board = f"{width}x{height}" if topology == Topology.SQUARE else f"{width}x{height} {topology}"
+            values = [board, mines, games, wins, f"{wins / games:.0%}",
+                      "-" if best_time is None else f"{best_time:.1f} s"]
+
+            for column, value in enumerate(values):
+                self.view.table.setItem(row, column, QTableWidgetItem(str(value)))
+
+        self.view.table.resizeColumnsToContents()
+
+
 class MinesweeperController(QMainWindow):
     """The minesweeper controller class, responsible for handling user input"""
 
-    # Reusable stylesheet blocks
-    RED_BG = "background-color: red; color: black;"
-    YELLOW_BG = "background-color: yellow; color: black;"
-    BLUE_BG = "background-color: blue; color: white;"
-    GREEN_BG = "background-color: green; color: black;"
-    FONT = "font-weight: 1000; font-size: 17px;"
-    NO_BORDER = "border: none;"
-
-    # Stylesheet constants for quick styling of fields
-    MINE_MISSED_STYLE = f"* {{ {RED_BG} {FONT} {NO_BORDER} }}"  # For mines the player hasn't found until the game ended
-    MINE_FOUND_STYLE = f"* {{ {GREEN_BG} {FONT} {NO_BORDER} }}"  # For mines the player had tagged before the game ended
-    MINE_TAGGED_STYLE = f"* {{ {YELLOW_BG} {FONT} {NO_BORDER} }}"  # For fields the player tagged as "mine"
-    MINE_POSSIBLE_STYLE = f"* {{ {BLUE_BG} {FONT} {NO_BORDER} }}"  # For fields the player tagged as "possibly a mine"
-
-    # Font styles for the labels specifying the number of adjacent mines - these are the original Minesweeper colors
-    UNCOVERED_STYLE = [
-        "",  # Fields with 0 bordering mines don't have any text
-        f"* {{ color: #0200fd; {FONT} {NO_BORDER} }}",  # 1 mine
-        f"* {{ color: #017e00; {FONT} {NO_BORDER} }}",  # 2 mines
-        f"* {{ color: red; {FONT} {NO_BORDER} }}",      # 3 mines
-        f"* {{ color: #010180; {FONT} {NO_BORDER} }}",  # 4 mines
-        f"* {{ color: #7f0300; {FONT} {NO_BORDER} }}",  # 5 mines
-        f"* {{ color: #008180; {FONT} {NO_BORDER} }}",  # 6 mines
-        f"* {{ color: black; {FONT} {NO_BORDER} }}",    # 7 mines
-        f"* {{ color: #808080; {FONT} {NO_BORDER} }}",  # 8 mines
-    ]
-
-    def __init__(self, columns: int = 9, rows: int = 9, mines: int = 10):
+    # The display states of tagged fields, by field state
+    TAG_DISPLAY = {
+        Field.COVERED: BoardView.COVERED,
+        Field.MINE_TAGGED: BoardView.MINE_TAGGED,
+        Field.MINE_POSSIBLE: BoardView.MINE_POSSIBLE,
+    }
+
+    def __init__(self, columns: int = 9, rows: int = 9, mines: int = 10, latency: LatencyTracker = None,
+                 show_latency: bool = False, statistics: StatisticsStore = None):
         """Initialize a game of Minesweeper
 
         This will create the game board and hide the specified number of mines on the board.
@@ -59,6 +75,10 @@ class MinesweeperController(QMainWindow):
         :param rows: The number of rows on the game board (the height). Default is 9.
         :param mines: The number of mines to hide on the game board. There cannot be more mines on the game board than
             there are fields. Default is 10.
+        :param latency: A LatencyTracker to measure the time between clicks and the updated board being painted.
+            Default is None (no measurement).
+        :param show_latency: Whether to display the latency percentiles in the status bar. Default is False.
+        :param statistics: A StatisticsStore to record every finished game in. Default is None (no statistics).
         """
         super().__init__(parent=None)
 
@@ -66,7 +86,10 @@ class MinesweeperController(QMainWindow):
         self.columns = 0
         self.rows = 0
         self.mines = 0
+        self.topology = Topology.SQUARE
         self.game_running = False
+        self.clicks = 0
+        self.start_time = None  # The time of the first click, None before the first click
 
         # Initialize the GUI
         self.view = Ui_MainWindow()
@@ -77,6 +100,7 @@ class MinesweeperController(QMainWindow):
         self.view.new_game_medium.triggered.connect(self.medium_game)
         self.view.new_game_difficult.triggered.connect(self.difficult_game)
         self.view.new_game_custom.triggered.connect(self.custom_game_dialog)
+        self.view.show_statistics.triggered.connect(self.statistics_dialog)
 
         # The model will be initialized in __new_game()
         self.model = None
@@ -85,62 +109,80 @@ class MinesweeperController(QMainWindow):
         self.dialog = CustomGameDialog()
         self.dialog.accepted.connect(self.__custom_game)
 
-        # Initialize a QSignalMapper to enable mapping all button clicks to a single method
-        self.mapper = QSignalMapper(self.view.centralwidget)
-        self.mapper.mapped.connect(self.button_clicked)
+        # A dialog window for the statistics of all finished games
+        self.statistics = statistics
+        self.statistics_view = StatisticsDialog()
+        self.view.show_statistics.setEnabled(self.statistics is not None)
 
-        # Initialize another QSignalMapper to enable mapping of right-clicks
-        self.rc_mapper = QSignalMapper(self.view.centralwidget)
-        self.rc_mapper.mapped.connect(self.button_right_clicked)
+        # The game board only paints the fields that are visible, so it can be scrolled and zoomed smoothly even with a
+        # million fields
+        self.board = BoardView()
+        self.view.main_layout.addWidget(self.board)
+        self.board.clicked.connect(self.button_clicked)
+        self.board.right_clicked.connect(self.button_right_clicked)
 
-        # Create a QGridLayout for the buttons
-        self.grid = QGridLayout()
-        self.view.main_layout.addLayout(self.grid)
-        self.grid.setSpacing(5)
+        # Measure the click-to-paint latency, if requested
+        self.latency = latency
+        self.latency_label = None
+        if self.latency is not None:
+            if show_latency:
+                self.latency_label = QLabel(self.latency.summary())
+                self.view.statusbar.addPermanentWidget(self.latency_label)
 
-        # This is the only efficient way to keep a reference to all buttons on the board, since buttons are
-        # "re-parented" to the main window after being added to a layout
-        self.buttons = []
-
-        self.grid.setSizeConstraint(QGridLayout.SetFixedSize)
+            self.board.painted.connect(self.__board_painted)
 
         self.__new_game(columns=columns, rows=rows, mines=mines)
 
     def button_clicked(self, position: int) -> None:
-        """Handle a click event on a button on the game board
+        """Handle a click event on a field on the game board
 
-        If the field underneath the button contains a mine, the game ends and a message is displayed.
-        If the field underneath the button is currently tagged (displayed as exclamation mark (!) or question mark (?)
-        on the game board, the field will not be uncovered and instead a message is displayed.
-        Otherwise, the field is uncovered. The button is replaced by a label displaying the number of mines on the
-        adjacent fields. If no adjacent field contains a mine, the untagged, uncovered adjacent fields will be
-        uncovered as well.
+        If the field contains a mine, the game ends and a message is displayed.
+        If the field is currently tagged (displayed as exclamation mark (!) or question mark (?) on the game board, the
+        field will not be uncovered and instead a message is displayed.
+        Otherwise, the field is uncovered and displays the number of mines on the adjacent fields. If no adjacent field
+        contains a mine, the untagged, covered adjacent fields will be uncovered as well.
 
-        :param position: The position of the button (width * y + x)
+        :param position: The position of the field (width * y + x)
         """
+        if self.latency is not None:
+            self.latency.input()
+
         x = position % self.columns
         y = int(position / self.columns)
 
         if self.game_running:
             self.__uncover_field(x, y)
+
+            if self.latency is not None:
+                self.latency.mark("widgets")
         else:
+            if self.latency is not None:
+                self.latency.cancel()
             self.view.statusbar.showMessage("You need to restart the game!", 5000)
 
     def button_right_clicked(self, position: int) -> None:
-        """Handle a right-click event on a button on the game board.
+        """Handle a right-click event on a field on the game board.
 
         Right-clicks tag the corresponding field. A field can be tagged as "having a mine" (displayed as an exclamation
         mark "!") or as "possibly having a mine" (displayed as a question mark "?"). Right-clicking a field switches
         between the states untagged, "having a mine" and "possibly having a mine". A tagged field cannot be uncovered.
 
-        :param position: The position of the button (width * y + x)
+        :param position: The position of the field (width * y + x)
         """
+        if self.latency is not None:
+            self.latency.input()
+
         x = position % self.columns
         y = int(position / self.columns)
 
         if self.game_running:
             self.__tag_field(x, y)
+
+            if self.latency is not None:
+                self.latency.mark("widgets")
         else:
+            if self.latency is not None:
+                self.latency.cancel()
             self.view.statusbar.showMessage("You need to restart the game!", 5000)
 
     def easy_game(self) -> None:
@@ -159,14 +201,22 @@ class MinesweeperController(QMainWindow):
         """Open a dialog window for the player to choose custom board dimensions and the number of mines"""
         self.dialog.exec()
 
+    def statistics_dialog(self) -> None:
+        """Open a dialog window showing the number of games, the win rate and the best time of every game board"""
+        self.statistics_view.load(self.statistics)
+        self.statistics_view.exec()
+
     def __custom_game(self) -> None:
         """Read the values for the custom game from the QDialog and start the game"""
         cols = self.dialog.view.columns.value()
         rows = self.dialog.view.rows.value()
-        mines = self.dialog.view.mines.value()
-        self.__new_game(columns=cols, rows=rows, mines=mines)
+        # There can't be more mines than fields
+        mines = min(self.dialog.view.mines.value(), cols * rows)
+        topology = Topology.ALL[self.dialog.view.topology.currentIndex()]
+        self.__new_game(columns=cols, rows=rows, mines=mines, topology=topology)
 
-    def __new_game(self, columns: int = 9, rows: int = 9, mines: int = 10) -> None:
+    @instrumentation.timed("controller.new_game")
+    def __new_game(self, columns: int = 9, rows: int = 9, mines: int = 10, topology: str = Topology.SQUARE) -> None:
         """Start a new game of Minesweeper
 
         This will create the game board and hide the specified number of mines on the board.
@@ -175,120 +225,94 @@ class MinesweeperController(QMainWindow):
         :param rows: The number of rows on the game board (the height). Default is 9.
         :param mines: The number of mines to hide on the game board. There cannot be more mines on the game board than
             there are fields. Default is 10.
+        :param topology: The topology of the game board, one of the Topology constants. Default is Topology.SQUARE.
         """
         self.columns = columns
         self.rows = rows
         self.mines = mines
+        self.topology = topology
         self.game_running = True
+        self.clicks = 0
+        self.start_time = None
+
+        # Initialize a new model. The seed is chosen here, so it can be recorded in the statistics.
+        self.model = MinesweeperModel(width=self.columns, height=self.rows, n_mines=mines,
+                                      seed=random.randrange(2 ** 32), topology=topology)
+        if self.statistics is not None:
+            # The 3BV is recorded when the game ends. It takes about as long as placing the mines, so it is calculated
+            # (and cached by the model) now instead of delaying the last click of the game.
+            self.model.three_bv()
 
-        # Initialize a new model
-        self.model = MinesweeperModel(width=self.columns, height=self.rows, n_mines=mines)
-
-        # Clear the QGridLayout
-        while True:
-            item = self.grid.takeAt(0)
-            if item is None:
-                break
-            else:
-                self.grid.removeItem(item)
-                item.widget().deleteLater()
-
-        # Clear the list of buttons
-        self.buttons.clear()
-
-        # Add the buttons to the GUI
-        for n in range(self.columns * self.rows):
-            # Create the QPushButton
-            button = QPushButton()
-            button.setFixedSize(40, 40)
-            button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-
-            # Connect the button signals
-            self.mapper.setMapping(button, n)
-            button.clicked.connect(self.mapper.map)  # For left-clicks
-            self.rc_mapper.setMapping(button, n)
-            button.customContextMenuRequested.connect(self.rc_mapper.map)  # For right-clicks
-            button.setContextMenuPolicy(Qt.CustomContextMenu)  # For enabling the customContextMenuRequested signal
-
-            # Add the button to the QGridLayout
-            self.grid.addWidget(button, int(n / self.columns), n % self.columns, alignment=Qt.AlignCenter)
-            self.buttons.append(button)
-
-        # Resize the grid rows
-        for i in range(self.grid.rowCount()):
-            self.grid.setRowMinimumHeight(i, 40)
-
-        # Resize the grid columns
-        for i in range(self.grid.columnCount()):
-            self.grid.setColumnMinimumWidth(i, 40)
+        self.board.set_board(self.columns, self.rows, topology=topology)
 
+        # Size the window to fit the whole board, unless it's larger than the screen - then it can be scrolled
         # For some reason, it really is that complicated to resize the window appropiately...
-        window_width = self.columns * 45 + 18
-        window_height = self.rows * 45 + 18 \
+        board_width, board_height = self.board.board_size()
+        window_width = board_width + 18 + 2 * self.board.frameWidth()
+        window_height = board_height + 18 + 2 * self.board.frameWidth() \
                         + self.view.menubar.sizeHint().height() \
-                        + self.view.statusbar.sizeHint().height() \
-                        + 18
+                        + self.view.statusbar.sizeHint().height()
 
-        self.setFixedSize(window_width, window_height)
+        screen = QApplication.desktop().availableGeometry(self)
+        self.resize(min(window_width, screen.width() * 9 // 10), min(window_height, screen.height() * 9 // 10))
 
+    @instrumentation.timed("controller.uncover_field")
     def __uncover_field(self, x: int, y: int) -> None:
         """Uncover a field on the game board
 
-        This method uncovers a field on the game board. If the field underneath the button contains a mine, the game
-        ends and a message is displayed. If the field underneath the button is currently tagged (displayed as
+        This method uncovers a field on the game board. If the field contains a mine, the game
+        ends and a message is displayed. If the field is currently tagged (displayed as
         exclamation mark (!) or question mark (?) on the game board, the field will not be uncovered.
 
-        Otherwise, the field is uncovered. The button is replaced by a label displaying the number of mines on the
-        adjacent fields. If no adjacent field contains a mine, the untagged, uncovered adjacent fields will be
-        uncovered as well.
+        Otherwise, the field is uncovered and displays the number of mines on the adjacent fields. If no adjacent field
+        contains a mine, the untagged, covered adjacent fields will be uncovered as well (see
+        MinesweeperModel.uncover_area()).
 
         :param x: The x coordinate (column) of the field to uncover (the leftmost column has the x coordinate 0).
         :param y: The y coordinate (row) of the field to uncover (the uppermost row has the y coordinate 0).
         """
         try:
-            n = self.model.uncover(x, y)
-
-            # The grid layout is accessed by row and column (y, x) instead of x, y
-            button = self.grid.itemAtPosition(y, x).widget()
-
-            # Replace the button with a label displaying the number of adjacent mines
-            label = QLabel(str(n) if n > 0 else "")
-            label.setStyleSheet(MinesweeperController.UNCOVERED_STYLE[n])
-            self.grid.replaceWidget(button, label, options=Qt.FindChildrenRecursively)
-
-            # Delete the button
-            button.deleteLater()
-            self.buttons.remove(button)
-
-            # If the field has 0 adjacent bombs, uncover the four directly surrounding fields as well
-            if n == 0:
-                if x - 1 >= 0 and self.model.field_state(x - 1, y) == Field.COVERED:
-                    self.__uncover_field(x - 1, y)  # Left field
-                if x - 1 >= 0 and y - 1 >= 0 and self.model.field_state(x - 1, y - 1) == Field.COVERED:
-                    self.__uncover_field(x - 1, y - 1)  # Top left field
-                if y - 1 >= 0 and self.model.field_state(x, y - 1) == Field.COVERED:
-                    self.__uncover_field(x, y - 1)  # Top field
-                if x + 1 < self.columns and y - 1 >= 0 and self.model.field_state(x + 1, y - 1) == Field.COVERED:
-                    self.__uncover_field(x + 1, y - 1)  # Top right field
-                if x + 1 < self.columns and self.model.field_state(x + 1, y) == Field.COVERED:
-                    self.__uncover_field(x + 1, y)  # Right field
-                if x + 1 < self.columns and y + 1 < self.rows and self.model.field_state(x + 1, y + 1) == Field.COVERED:
-                    self.__uncover_field(x + 1, y + 1)  # Bottom right field
-                if y + 1 < self.rows and self.model.field_state(x, y + 1) == Field.COVERED:
-                    self.__uncover_field(x, y + 1)  # Bottom field
-                if x - 1 >= 0 and y + 1 < self.rows and self.model.field_state(x - 1, y + 1) == Field.COVERED:
-                    self.__uncover_field(x - 1, y + 1)  # Bottom left field
+            uncovered = self.model.uncover_area(x, y)
+            self.__count_click()
+
+            if self.latency is not None:
+                self.latency.mark("model")
+
+            # The display state of an uncovered field is its number of adjacent mines
+            self.board.set_fields(uncovered)
+            instrumentation.registry.increment("controller.uncovered_fields", len(uncovered))
 
         except AlreadyUncoveredError:
-            pass
+            # The board doesn't change, so there is no paint to measure
+            if self.latency is not None:
+                self.latency.cancel()
         except FieldTaggedError:
+            if self.latency is not None:
+                self.latency.cancel()
             self.view.statusbar.showMessage("You need to untag the field before you can open it", 5000)
         except MineFound:
+            self.__count_click()
+            if self.latency is not None:
+                self.latency.mark("model")
             self.__end_game(won=False)
 
         if self.model.won():
             self.__end_game(won=True)
 
+    def __count_click(self) -> None:
+        """Count an accepted click on the game board for the statistics, starting the clock with the first one
+
+        Clicks that don't change the board (e.g. on a tagged field) are not counted.
+        """
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        self.clicks += 1
+
+    def __board_painted(self) -> None:
+        """Complete the pending latency measurement and update the percentiles in the status bar"""
+        if self.latency.painted() and self.latency_label is not None:
+            self.latency_label.setText(self.latency.summary())
+
     def __tag_field(self, x: int, y: int) -> None:
         """Tag a field on the game board.
 
@@ -300,49 +324,56 @@ class MinesweeperController(QMainWindow):
         :param y: The y coordinate (row) of the field to uncover (the uppermost row has the y coordinate 0).
         """
         try:
-            # The grid layout is accessed by row and column (y, x) instead of x, y
-            button = self.grid.itemAtPosition(y, x).widget()
-
             new_state = self.model.switch_tagging(x, y)
-            if new_state == Field.COVERED:
-                button.setStyleSheet("")
-                button.setText("")
-            elif new_state == Field.MINE_TAGGED:
-                button.setStyleSheet(MinesweeperController.MINE_TAGGED_STYLE)
-                button.setText("!")
-            elif new_state == Field.MINE_POSSIBLE:
-                button.setStyleSheet(MinesweeperController.MINE_POSSIBLE_STYLE)
-                button.setText("?")
+            self.__count_click()
+
+            if self.latency is not None:
+                self.latency.mark("model")
+
+            self.board.set_field(x, y, MinesweeperController.TAG_DISPLAY[new_state])
 
         except AlreadyUncoveredError:
-            pass
+            # The board doesn't change, so there is no paint to measure
+            if self.latency is not None:
+                self.latency.cancel()
 
+    @instrumentation.timed("controller.end_game")
     def __end_game(self, won: bool = False) -> None:
         """End the game
 
-        This method ends the game by disabling all buttons, displaying the positions of the mines on the game board
-        and displaying a message for the user.
+        This method ends the game by disabling the game board, displaying the positions of the mines on the game board
+        and (after the current event has been handled) displaying a message for the user.
 
         :param won: True if the game has been won (i.e. all fields without a mine have been uncovered), False if the
             game has been lost (i.e. the player tried to uncover a field with a mine)
         """
         # End the game
         self.game_running = False
+        instrumentation.registry.increment("controller.games_won" if won else "controller.games_lost")
+
+        if self.statistics is not None:
+            duration = time.monotonic() - self.start_time if self.start_time is not None else 0.0
+            self.statistics.record(self.columns, self.rows, self.mines, won=won, duration=duration,
+                                   clicks=self.clicks, three_bv=self.model.three_bv(), seed=self.model.seed,
+                                   topology=self.topology)
 
-        # Disable all buttons
-        for button in self.buttons:
-            button.setEnabled(False)
+        # Disable the game board
+        self.board.set_finished()
 
         # Show the mine positions:
-        for x, y in self.model.mines:
-            # The grid layout is accessed by row and column (y, x) instead of x, y
-            widget = self.grid.itemAtPosition(y, x).widget()
-            widget.setText("\u2715")
+        self.board.set_fields([(x, y, BoardView.MINE_MISSED if self.model.field_state(x, y) == Field.COVERED
+                                else BoardView.MINE_FOUND) for x, y in self.model.mines])
 
-            if self.model.field_state(x, y) == Field.COVERED:
-                widget.setStyleSheet(MinesweeperController.MINE_MISSED_STYLE)
-            else:
-                widget.setStyleSheet(MinesweeperController.MINE_FOUND_STYLE)
+        # Display a message once the click has been handled, so the time the player takes to close it isn't part of
+        # the timings of __end_game() and __uncover_field()
+        QTimer.singleShot(0, lambda: self.__show_result(won))
 
-        # Display a message
+    def __show_result(self, won: bool) -> None:
+        """Display a message telling the player whether the game has been won or lost
+
+        :param won: True if the game has been won, False if it has been lost
+        """
+        # Paint the final board before the modal message box blocks, so it is visible behind the message box and the
+        # click-to-paint latency doesn't include the time the message box is open
+        self.board.viewport().repaint()
         QMessageBox.information(self, "Minesweeper", "You won :)" if won else "You lost :)")
@@ -11,9 +11,9 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 class Ui_Dialog(object):
     def setupUi(self, Dialog):
         Dialog.setObjectName("Dialog")
-        Dialog.resize(276, 167)
+        Dialog.resize(276, 197)
         self.verticalLayoutWidget = QtWidgets.QWidget(Dialog)
-        self.verticalLayoutWidget.setGeometry(QtCore.QRect(10, 10, 253, 142))
+        self.verticalLayoutWidget.setGeometry(QtCore.QRect(10, 10, 253, 172))
         self.verticalLayoutWidget.setObjectName("verticalLayoutWidget")
         self.verticalLayout = QtWidgets.QVBoxLayout(self.verticalLayoutWidget)
         self.verticalLayout.setContentsMargins(0, 0, 0, 0)
@@ -39,20 +39,32 @@ class Ui_Dialog(object):
         self.gridLayout.addWidget(self.colummns_label, 0, 0, 1, 1)
         self.columns = QtWidgets.QSpinBox(self.verticalLayoutWidget)
         self.columns.setMinimum(3)
+        self.columns.setMaximum(1000)
         self.columns.setProperty("value", 9)
         self.columns.setObjectName("columns")
         self.gridLayout.addWidget(self.columns, 0, 1, 1, 1)
         self.rows = QtWidgets.QSpinBox(self.verticalLayoutWidget)
         self.rows.setMinimum(3)
+        self.rows.setMaximum(1000)
         self.rows.setProperty("value", 9)
         self.rows.setObjectName("rows")
         self.gridLayout.addWidget(self.rows, 1, 1, 1, 1)
         self.mines = QtWidgets.QSpinBox(self.verticalLayoutWidget)
         self.mines.setMinimum(1)
-        self.mines.setMaximum(9800)
+        self.mines.setMaximum(1000000)
         self.mines.setProperty("value", 10)
         self.mines.setObjectName("mines")
         self.gridLayout.addWidget(self.mines, 2, 1, 1, 1)
+        self.topology_label = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.topology_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.topology_label.setObjectName("topology_label")
+        self.gridLayout.addWidget(self.topology_label, 3, 0, 1, 1)
+        self.topology = QtWidgets.QComboBox(self.verticalLayoutWidget)
+        self.topology.setObjectName("topology")
+        self.topology.addItem("")
+        self.topology.addItem("")
+        self.topology.addItem("")
+        self.gridLayout.addWidget(self.topology, 3, 1, 1, 1)
         self.verticalLayout.addLayout(self.gridLayout)
         self.buttonBox = QtWidgets.QDialogButtonBox(self.verticalLayoutWidget)
         self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
@@ -69,4 +81,8 @@ class Ui_Dialog(object):
         self.mines_label.setText(_translate("Dialog", "Mines"))
         self.rows_label.setText(_translate("Dialog", "Rows"))
         self.colummns_label.setText(_translate("Dialog", "Columns"))
+        self.topology_label.setText(_translate("Dialog", "Board"))
+        self.topology.setItemText(0, _translate("Dialog", "Square"))
+        self.topology.setItemText(1, _translate("Dialog", "Torus (wrap-around)"))
+        self.topology.setItemText(2, _translate("Dialog", "Hexagonal"))
 
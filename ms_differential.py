@@ -0,0 +1,279 @@
+"""Differential testing of Minesweeper board engines
+
+Random seeded boards and random move sequences are played on the reference MinesweeperModel and on every alternative
+engine in ENGINES. After every move, the results (or raised exceptions), the field states and won() have to match
+exactly. The time every engine spends is recorded, so each run doubles as a performance comparison.
+
+NaiveModel is a deliberately simple engine (a matrix of Fields, bounds checks for every neighbour and a full scan in
+won()) that serves as an oracle for the optimized reference model.
+
+Usage: python ms_differential.py [number of cases] [first seed]
+"""
+
+import random
+import sys
+import time
+from collections import namedtuple
+
+from ms_model import *
+
+# The first step at which an engine's trace differs from the reference model's trace
+Mismatch = namedtuple("Mismatch", ["engine", "seed", "width", "height", "n_mines", "topology", "step", "move",
+                                   "expected", "actual"])
+
+# The moves played by the harness, with their relative frequencies
+MOVES = (("uncover", 4), ("uncover_area", 4), ("switch_tagging", 2), ("chord", 2), ("field_state", 1))
+
+
+class NaiveModel:
+    """A straightforward engine with the same interface as MinesweeperModel, used as an oracle"""
+
+    def __init__(self, width: int = 9, height: int = 9, n_mines: int = 10, seed: int = None,
+                 topology: str = Topology.SQUARE):
+        """Initialize a new NaiveModel, placing the mines exactly like MinesweeperModel does for the same seed"""
+        if n_mines > width * height:
+            raise ValueError("The number of mines can't be higher than the number of fields on the board")
+        if topology not in Topology.ALL:
+            raise ValueError(f"Unknown topology: {topology}")
+
+        self.width = width
+        self.height = height
+        self.n_mines = n_mines
+        self.seed = seed
+        self.topology = topology
+        self.mines = []
+        self.board = [[Field() for y in range(height)] for x in range(width)]
+
+        rng = random.Random(seed)
+        for i in range(n_mines):
+            while True:
+                x = rng.randrange(0, width)
+                y = rng.randrange(0, height)
+                if not self.board[x][y].mine:
+                    self.board[x][y].mine = True
+                    self.mines.append((x, y))
+                    break
+
+    def neighbours(self, x: int, y: int) -> list:
+        """Get the coordinates of all Fields adjacent to the specified Field, checking each one separately"""
+        result = []
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                if self.topology == Topology.HEXAGONAL:
+                    # Odd rows are shifted right by half a field: the fields above and below are at dx 0 and 1
+                    # instead of -1 and 0
+                    if dy != 0 and dx == (-1 if y % 2 else 1):
+                        continue
+
+                temp_x, temp_y = x + dx, y + dy
+                if self.topology == Topology.TORUS:
+                    temp_x, temp_y = temp_x % self.width, temp_y % self.height
+                    if (temp_x, temp_y) == (x, y) or (temp_x, temp_y) in result:
+                        continue
+                elif not (0 <= temp_x < self.width and 0 <= temp_y < self.height):
+                    continue
+
+                result.append((temp_x, temp_y))
+        return result
+
+    def field_state(self, x: int, y: int) -> int:
+        """Get the field state of the specified Field"""
+        self.__check_bounds(x, y)
+        return self.board[x][y].state
+
+    def switch_tagging(self, x: int, y: int) -> int:
+        """Switch the field state of the specified Field"""
+        self.__check_bounds(x, y)
+        return self.board[x][y].switch_tagging()
+
+    def uncover(self, x: int, y: int) -> int:
+        """Uncover the specified Field and count the mines on the adjacent Fields"""
+        self.__check_bounds(x, y)
+        self.board[x][y].uncover()
+        return self.__mines_around(x, y)
+
+    def uncover_area(self, x: int, y: int) -> list:
+        """Uncover the specified Field and the area of Fields around it"""
+        uncovered = [(x, y, self.uncover(x, y))]
+        self.__cascade(uncovered)
+        return uncovered
+
+    def chord(self, x: int, y: int) -> list:
+        """Uncover all untagged Fields around an uncovered Field whose mines have all been tagged"""
+        self.__check_bounds(x, y)
+        if self.board[x][y].state != Field.UNCOVERED:
+            return []
+
+        around = self.neighbours(x, y)
+        if sum(1 for temp_x, temp_y in around if self.board[temp_x][temp_y].state == Field.MINE_TAGGED) \
+                != self.__mines_around(x, y):
+            return []
+
+        uncovered = []
+        try:
+            for temp_x, temp_y in around:
+                if self.board[temp_x][temp_y].state == Field.COVERED:
+                    uncovered.append((temp_x, temp_y, self.uncover(temp_x, temp_y)))
+        except MineFound as e:
+            e.uncovered = uncovered
+            raise
+        self.__cascade(uncovered)
+        return uncovered
+
+    def won(self) -> bool:
+        """Check whether all empty Fields have been uncovered, scanning the whole board"""
+        return all(field.state == Field.UNCOVERED or field.mine for column in self.board for field in column)
+
+    def __check_bounds(self, x: int, y: int) -> None:
+        """Make sure the coordinates are on the game board, raising a ValueError otherwise"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Illegal coordinates: {x}, {y}")
+
+    def __mines_around(self, x: int, y: int) -> int:
+        """Count the mines on the adjacent Fields"""
+        return sum(1 for temp_x, temp_y in self.neighbours(x, y) if self.board[temp_x][temp_y].mine)
+
+    def __cascade(self, uncovered: list) -> None:
+        """Uncover the areas around all Fields with 0 adjacent mines in the list, appending each Field uncovered"""
+        for x, y, n in uncovered:
+            if n == 0:
+                for temp_x, temp_y in self.neighbours(x, y):
+                    if self.board[temp_x][temp_y].state == Field.COVERED:
+                        uncovered.append((temp_x, temp_y, self.uncover(temp_x, temp_y)))
+
+
+# The alternative engines compared against the reference MinesweeperModel, by name
+ENGINES = {
+    "naive": NaiveModel,
+}
+
+
+def random_moves(rng: random.Random, width: int, height: int, n: int) -> list:
+    """Generate a random sequence of moves
+
+    About one in fifty moves of every kind is outside of the game board (just beyond any of the four edges), to check
+    that the engines reject it the same way.
+
+    :param rng: The random number generator
+    :param width: The width (number of columns) of the game board
+    :param height: The height (number of rows) of the game board
+    :param n: The number of moves
+    :return: A list of (method name, x, y) tuples
+    """
+    names = [name for name, weight in MOVES for i in range(weight)]
+    moves = []
+    for i in range(n):
+        name = rng.choice(names)
+        if rng.random() < 0.02:
+            if rng.random() < 0.5:
+                moves.append((name, rng.choice([-1, width]), rng.randrange(height)))
+            else:
+                moves.append((name, rng.randrange(width), rng.choice([-1, height])))
+        else:
+            moves.append((name, rng.randrange(width), rng.randrange(height)))
+    return moves
+
+
+def play(engine, moves: list, width: int, height: int, n_mines: int, seed: int, topology: str) -> tuple:
+    """Play a move sequence on an engine, recording the outcome of every move
+
+    Any exception raised by a move is recorded by its type name and the Fields uncovered before a mine was found (see
+    MineFound), so engines have to raise exactly the same exceptions (an IndexError instead of a ValueError is a
+    mismatch, not a crash of the harness). The sequence ends early when a mine is found or the game is won, since the
+    game is over then.
+
+    :param engine: The engine class (or another callable creating a game with the MinesweeperModel arguments)
+    :param moves: A list of (method name, x, y) tuples
+    :param width: The width (number of columns) of the game board
+    :param height: The height (number of rows) of the game board
+    :param n_mines: The number of mines to hide on the game board
+    :param seed: The seed for placing the mines
+    :param topology: The topology of the game board
+    :return: A tuple (trace, seconds spent in the engine). The trace starts with the mine positions, followed by one
+        entry per move: (outcome, won(), field states).
+    """
+    start = time.perf_counter()
+    game = engine(width=width, height=height, n_mines=n_mines, seed=seed, topology=topology)
+    seconds = time.perf_counter() - start
+    trace = [sorted(game.mines)]
+
+    for name, x, y in moves:
+        start = time.perf_counter()
+        try:
+            result = getattr(game, name)(x, y)
+            outcome = None
+        except Exception as e:
+            # The Fields a chord uncovered before finding a mine are part of the outcome (see MineFound)
+            outcome = ("raise", type(e).__name__, sorted(getattr(e, "uncovered", ())))
+        won = game.won()
+        seconds += time.perf_counter() - start
+
+        if outcome is None:
+            # The order of uncovered fields may differ between flood fill implementations
+            outcome = ("ok", sorted(result) if isinstance(result, list) else result)
+
+        # Reading the field states is not part of the timing, it's only needed for the comparison
+        trace.append((outcome, won, [game.field_state(i, j) for j in range(height) for i in range(width)]))
+
+        if won or outcome[:2] == ("raise", "MineFound"):
+            break
+
+    return trace, seconds
+
+
+def compare(seed: int, engines: dict = None, n_moves: int = 200, timings: dict = None) -> list:
+    """Play a random board and move sequence on the reference model and all engines, and compare the outcomes
+
+    :param seed: The seed for the board dimensions, the mines and the moves
+    :param engines: The engines to compare against the reference, by name. Default is ENGINES.
+    :param n_moves: The number of moves to generate. Default is 200.
+    :param timings: A dict to add the seconds spent by every engine to, by name (the reference as "reference").
+        Default is None (the timings are discarded).
+    :return: A list of Mismatches, one per engine at most (the first differing step), empty if all engines agree
+    """
+    rng = random.Random(seed)
+    width = rng.randrange(1, 25)
+    height = rng.randrange(1, 25)
+    n_mines = rng.randrange(0, width * height // 4 + 1)
+    topology = rng.choice(Topology.ALL)
+    moves = random_moves(rng, width, height, n_moves)
+
+    expected, seconds = play(MinesweeperModel, moves, width, height, n_mines, seed, topology)
+    if timings is not None:
+        timings["reference"] = timings.get("reference", 0.0) + seconds
+
+    mismatches = []
+    for name, engine in (ENGINES if engines is None else engines).items():
+        actual, seconds = play(engine, moves, width, height, n_mines, seed, topology)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + seconds
+
+        for step in range(max(len(expected), len(actual))):
+            if step >= len(expected) or step >= len(actual) or expected[step] != actual[step]:
+                mismatches.append(Mismatch(
+                    name, seed, width, height, n_mines, topology, step, moves[step - 1] if step > 0 else None,
+                    expected[step] if step < len(expected) else None, actual[step] if step < len(actual) else None))
+                break
+
+    return mismatches
+
+
+if __name__ == "__main__":
+    n_cases = int(sys.argv[1]) if len(sys.argv) >= 2 else 500
+    first_seed = int(sys.argv[2]) if len(sys.argv) >= 3 else 0
+
+    timings = {}
+    mismatches = []
+    for seed in range(first_seed, first_seed + n_cases):
+        mismatches.extend(compare(seed, timings=timings))
+
+    for mismatch in mismatches:
+        print(mismatch)
+
+    print(f"{n_cases} cases, {len(mismatches)} mismatches")
+    for name, seconds in sorted(timings.items(), key=lambda item: item[1]):
+        print(f"{name:>12}: {seconds:.3f} s ({seconds / timings['reference']:.2f}x reference)")
+
+    sys.exit(1 if mismatches else 0)
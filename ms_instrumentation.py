@@ -0,0 +1,253 @@
+"""Opt-in instrumentation for the Minesweeper game
+
+Methods decorated with timed() record how often they are called and how long the calls take. Instrumentation is
+disabled by default. It can be enabled with enable() or by setting the environment variable MINESWEEPER_INSTRUMENT=1.
+While it is disabled, the classes hold the undecorated methods, so instrumentation costs nothing at all; enable() and
+disable() swap the timing wrappers in and out.
+
+The recorded metrics can be exported as a JSON snapshot (write_json()) or served in the Prometheus text format on a
+local HTTP endpoint (serve()). profile_session() wraps a whole session in cProfile.
+"""
+
+import bisect
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds of the histogram buckets in seconds (the last bucket collects everything above)
+BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    """A histogram of durations, counting how many durations fall into each of the BUCKETS"""
+
+    def __init__(self):
+        """Create a new, empty Histogram"""
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        """Add a duration to the Histogram
+
+        :param seconds: The duration in seconds
+        """
+        self.count += 1
+        self.sum += seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+
+class Registry:
+    """A collection of named counters and histograms"""
+
+    def __init__(self):
+        """Create a new, empty Registry. Instrumentation is enabled if MINESWEEPER_INSTRUMENT is set to 1."""
+        self.enabled = os.environ.get("MINESWEEPER_INSTRUMENT") == "1"
+        self.counters = {}
+        self.histograms = {}
+
+    def histogram(self, name: str) -> Histogram:
+        """Get the Histogram with the specified name, creating it if necessary
+
+        :param name: The name of the Histogram, e.g. "model.uncover"
+        :return: The Histogram
+        """
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def increment(self, name: str, n: int = 1) -> None:
+        """Increment the counter with the specified name
+
+        :param name: The name of the counter
+        :param n: The value to add to the counter. Default is 1.
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self) -> None:
+        """Discard all recorded values"""
+        self.counters.clear()
+        self.histograms.clear()
+
+    def snapshot(self) -> dict:
+        """Get all recorded values
+
+        :return: A dict with the counters and the histograms (count, sum and bucket counts), by name
+        """
+        return {
+            "counters": dict(self.counters),
+            "histograms": {
+                name: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    "buckets": {str(bound): n for bound, n in zip(BUCKETS + ("+Inf",), h.buckets)},
+                }
+                for name, h in self.histograms.items()
+            },
+        }
+
+    def prometheus_text(self) -> str:
+        """Format all recorded values in the Prometheus text exposition format
+
+        :return: The formatted values. Dots in the names are replaced by underscores.
+        """
+        lines = []
+
+        # The values may be served from another thread while new names are being added, so the dicts are copied first
+        for name, value in sorted(list(self.counters.items())):
+            metric = "minesweeper_" + name.replace(".", "_") + "_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        for name, h in sorted(list(self.histograms.items())):
+            metric = "minesweeper_" + name.replace(".", "_") + "_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(BUCKETS + ("+Inf",), h.buckets):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{metric}_sum {h.sum}")
+            lines.append(f"{metric}_count {h.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+# The registry used by timed(), measure() and the export functions
+registry = Registry()
+
+# The methods decorated with timed(), as (class, attribute name, undecorated function, timing wrapper) tuples
+_timed_methods = []
+
+
+def _install_methods() -> None:
+    """Set every method decorated with timed() to its timing wrapper or to the undecorated function, depending on
+    whether instrumentation is enabled"""
+    for owner, name, function, wrapper in _timed_methods:
+        setattr(owner, name, wrapper if registry.enabled else function)
+
+
+def enable() -> None:
+    """Start recording metrics"""
+    registry.enabled = True
+    _install_methods()
+
+
+def disable() -> None:
+    """Stop recording metrics. Values recorded so far are kept."""
+    registry.enabled = False
+    _install_methods()
+
+
+class _TimedMethod:
+    """A placeholder for a method decorated with timed()
+
+    When the class is created, the placeholder replaces itself with the timing wrapper or the undecorated function and
+    registers both, so enable() and disable() can switch between them later.
+    """
+
+    def __init__(self, function, wrapper):
+        self.function = function
+        self.wrapper = wrapper
+
+    def __set_name__(self, owner, name):
+        _timed_methods.append((owner, name, self.function, self.wrapper))
+        setattr(owner, name, self.wrapper if registry.enabled else self.function)
+
+
+def timed(name: str):
+    """Decorator recording the number and duration of calls to a method while instrumentation is enabled
+
+    Only methods defined in a class body can be decorated. Bound methods taken while instrumentation was disabled (e.g.
+    connected to a signal) keep calling the undecorated method, so instrumentation should be enabled first.
+
+    :param name: The name of the Histogram to record the durations in
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                registry.histogram(name).observe(time.perf_counter() - start)
+
+        return _TimedMethod(function, wrapper)
+
+    return decorator
+
+
+@contextmanager
+def measure(name: str):
+    """Context manager recording the duration of a block of code while instrumentation is enabled
+
+    :param name: The name of the Histogram to record the duration in
+    """
+    if not registry.enabled:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.histogram(name).observe(time.perf_counter() - start)
+
+
+def write_json(path: str) -> None:
+    """Write a snapshot of all recorded values to a JSON file
+
+    :param path: The path of the file
+    """
+    with open(path, "w") as f:
+        json.dump(registry.snapshot(), f, indent=2)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Request handler answering every GET request with the recorded values in the Prometheus text format"""
+
+    def do_GET(self):
+        body = registry.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Don't clutter the console with a line per scrape
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the recorded values in the Prometheus text format on a local HTTP endpoint, in a background thread
+
+    :param port: The port to listen on
+    :param host: The address to listen on. Default is 127.0.0.1 (only reachable from the local machine).
+    :return: The server, which can be stopped using shutdown()
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@contextmanager
+def profile_session(path: str):
+    """Context manager running the enclosed code under cProfile and writing the statistics to a file on exit
+
+    The statistics file can be inspected with the pstats module or tools like snakeviz.
+
+    :param path: The path of the statistics file
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,106 @@
+"""Measurement of the latency between a click on the game board and the updated board being painted
+
+The controller reports four points in time for every click: the input event, the end of the model update, the end of
+the widget update and the end of the next paint. The LatencyTracker keeps the latencies of the most recent clicks and
+calculates rolling percentiles from them.
+"""
+
+import json
+import math
+import time
+from collections import deque
+
+
+class LatencyTracker:
+    """Rolling click-to-paint latency statistics"""
+
+    # The stages of handling a click, in the order they are reached
+    STAGES = ("model", "widgets", "paint")
+
+    def __init__(self, window: int = 1000):
+        """Create a new LatencyTracker
+
+        :param window: The number of recent clicks to calculate the percentiles from. Default is 1000.
+        """
+        self.samples = {stage: deque(maxlen=window) for stage in LatencyTracker.STAGES}
+        self.__start = None  # The time of the pending input event, None if there is none
+        self.__marks = {}
+
+    @property
+    def pending(self) -> bool:
+        """Whether an input event is waiting for its paint"""
+        return self.__start is not None
+
+    def input(self) -> None:
+        """Record the arrival of an input event. A previous input event that has not been painted yet is dropped."""
+        self.__start = time.perf_counter()
+        self.__marks = {}
+
+    def cancel(self) -> None:
+        """Drop the pending input event, e.g. because it didn't change the board, so the next paint isn't measured"""
+        self.__start = None
+        self.__marks = {}
+
+    def mark(self, stage: str) -> None:
+        """Record that a stage of handling the pending input event has been reached
+
+        Only the first mark of each stage counts, so a stage can be marked repeatedly (e.g. in a recursive method).
+
+        :param stage: The stage, "model" or "widgets"
+        """
+        if self.__start is not None and stage not in self.__marks:
+            self.__marks[stage] = time.perf_counter() - self.__start
+
+    def painted(self) -> bool:
+        """Record that the board has been painted, completing the measurement of the pending input event
+
+        :return: True if a measurement has been completed, False if there was no pending input event
+        """
+        if self.__start is None:
+            return False
+
+        self.__marks["paint"] = time.perf_counter() - self.__start
+        for stage in LatencyTracker.STAGES:
+            # Stages that haven't been marked (e.g. because the click was ignored) end with the next one
+            self.samples[stage].append(self.__marks.setdefault(stage, self.__marks["paint"]))
+
+        self.__start = None
+        return True
+
+    def percentiles(self, stage: str = "paint") -> tuple:
+        """Calculate the 50th, 95th and 99th percentile of the latencies of a stage
+
+        :param stage: The stage, "model", "widgets" or "paint". Default is "paint".
+        :return: A tuple (p50, p95, p99) in seconds, or None if no latencies have been recorded yet
+        """
+        samples = sorted(self.samples[stage])
+        if not samples:
+            return None
+
+        # Nearest-rank percentiles
+        return tuple(samples[max(0, math.ceil(p / 100 * len(samples)) - 1)] for p in (50, 95, 99))
+
+    def summary(self) -> str:
+        """Describe the click-to-paint percentiles for the status bar
+
+        :return: The description, e.g. "Click to paint: p50 3.1 ms, p95 7.9 ms, p99 12.0 ms"
+        """
+        percentiles = self.percentiles()
+        if percentiles is None:
+            return "Click to paint: no clicks yet"
+
+        p50, p95, p99 = (p * 1000 for p in percentiles)
+        return f"Click to paint: p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms"
+
+    def write_json(self, path: str) -> None:
+        """Write the percentiles of all stages to a JSON file
+
+        :param path: The path of the file
+        """
+        result = {"clicks": len(self.samples["paint"])}
+        for stage in LatencyTracker.STAGES:
+            percentiles = self.percentiles(stage)
+            result[stage] = None if percentiles is None else dict(zip(("p50", "p95", "p99"), percentiles))
+
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
@@ -0,0 +1,142 @@
+"""Difficulty metrics of Minesweeper game boards
+
+All metrics are calculated in a single pass over the neighbour table of a board, using two union-find structures: one
+joining adjacent fields without adjacent mines into openings, and one joining adjacent empty fields into regions.
+batch_metrics() calculates the metrics of many boards of the same dimensions from stacked mine flags.
+"""
+
+from collections import namedtuple
+
+from ms_topology import Topology, neighbour_table
+
+BoardMetrics = namedtuple("BoardMetrics", ["three_bv", "openings", "isolated_numbers", "estimated_guesses"])
+BoardMetrics.__doc__ = """The difficulty metrics of a game board
+
+three_bv: The minimum number of clicks needed to uncover all empty fields (openings + isolated numbers)
+openings: The number of openings, i.e. areas of fields with 0 adjacent mines that are uncovered with a single click
+isolated_numbers: The number of empty fields with adjacent mines that are not next to an opening
+estimated_guesses: A rough lower bound of the number of guesses needed: one blind click to enter each region of empty
+    fields that is separated from the other regions by mines
+"""
+
+
+def _find(parent: list, i: int) -> int:
+    """Find the representative of a set in a union-find structure, halving the path on the way
+
+    :param parent: The parent of every element
+    :param i: The element
+    :return: The representative of the set containing the element
+    """
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent: list, i: int, j: int) -> None:
+    """Join the sets of two elements in a union-find structure
+
+    :param parent: The parent of every element
+    :param i: The first element
+    :param j: The second element
+    """
+    i = _find(parent, i)
+    j = _find(parent, j)
+    if i != j:
+        parent[max(i, j)] = min(i, j)
+
+
+def board_metrics(mines, counts, offsets, indices) -> BoardMetrics:
+    """Calculate the difficulty metrics of a game board
+
+    Fields are numbered row by row (width * y + x), see ms_topology.neighbour_table().
+
+    :param mines: For every field, whether it contains a mine (e.g. a bytearray of 0 and 1)
+    :param counts: For every field, the number of adjacent mines
+    :param offsets: The offsets of the neighbour table of the board
+    :param indices: The indices of the neighbour table of the board
+    :return: The BoardMetrics of the board
+    """
+    n = len(counts)
+    opening = list(range(n))  # Joins adjacent fields with 0 adjacent mines
+    region = list(range(n))  # Joins adjacent empty fields
+    bordered = bytearray(n)  # Fields with adjacent mines that are next to an opening
+
+    for i in range(n):
+        if mines[i]:
+            continue
+
+        zero = counts[i] == 0
+        for j in indices[offsets[i]:offsets[i + 1]]:
+            if mines[j]:
+                continue
+
+            # Every pair of neighbours is seen twice, joining them once is enough
+            if j < i:
+                _union(region, i, j)
+            if zero:
+                if counts[j] > 0:
+                    bordered[j] = True
+                elif j < i:
+                    _union(opening, i, j)
+
+    openings = 0
+    isolated_numbers = 0
+    regions = 0
+    for i in range(n):
+        if mines[i]:
+            continue
+        if region[i] == i:
+            # Representatives are always the smallest element of their set, so they never have a parent
+            regions += 1
+        if counts[i] == 0:
+            openings += opening[i] == i
+        elif not bordered[i]:
+            isolated_numbers += 1
+
+    return BoardMetrics(three_bv=openings + isolated_numbers, openings=openings, isolated_numbers=isolated_numbers,
+                        estimated_guesses=regions)
+
+
+def mine_counts(mines, offsets, indices) -> bytearray:
+    """Count the adjacent mines of every field of a game board
+
+    :param mines: For every field, whether it contains a mine (e.g. a bytearray of 0 and 1)
+    :param offsets: The offsets of the neighbour table of the board
+    :param indices: The indices of the neighbour table of the board
+    :return: A bytearray with the number of adjacent mines of every field
+    """
+    counts = bytearray(len(mines))
+    for i, mine in enumerate(mines):
+        if mine:
+            for j in indices[offsets[i]:offsets[i + 1]]:
+                counts[j] += 1
+    return counts
+
+
+def batch_metrics(mines, width: int, height: int, topology: str = Topology.SQUARE) -> list:
+    """Calculate the difficulty metrics of many game boards of the same dimensions at once, e.g. for ranking a pool of
+    generated boards
+
+    The boards are given as stacked mine flags, so no MinesweeperModel has to be created for them, and they share a
+    single neighbour table.
+
+    :param mines: The mine flags of all boards, one board after another: for every field of every board, whether it
+        contains a mine (e.g. a bytearray of 0 and 1 with width * height items per board)
+    :param width: The width (number of columns) of the game boards
+    :param height: The height (number of rows) of the game boards
+    :param topology: The topology of the game boards, one of the Topology constants. Default is Topology.SQUARE.
+    :return: A list with the BoardMetrics of every board, in the same order
+
+    :raises ValueError: If the number of mine flags is not a multiple of the number of fields per board
+    """
+    n = width * height
+    if len(mines) % n != 0:
+        raise ValueError(f"The number of mine flags ({len(mines)}) is not a multiple of {n} (width * height)")
+
+    offsets, indices = neighbour_table(width, height, topology)
+    results = []
+    for start in range(0, len(mines), n):
+        board = mines[start:start + n]
+        results.append(board_metrics(board, mine_counts(board, offsets, indices), offsets, indices))
+    return results
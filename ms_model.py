@@ -1,5 +1,9 @@
 import random
 
+from ms_instrumentation import timed
+from ms_metrics import BoardMetrics, board_metrics
+from ms_topology import Topology, neighbour_table
+
 
 class Field:
     """A class representing a field on the Minesweeper game board.
@@ -70,13 +74,15 @@ class FieldTaggedError(Exception):
 
 
 class MineFound(Exception):
-    pass
+    # The (x, y, number of adjacent mines) tuples of the Fields uncovered by the same move before the mine was found
+    uncovered = ()
 
 
 class MinesweeperModel:
     """The model class for the Minesweeper game, containing the game logic"""
 
-    def __init__(self, width: int = 9, height: int = 9, n_mines: int = 10):
+    def __init__(self, width: int = 9, height: int = 9, n_mines: int = 10, seed: int = None,
+                 topology: str = Topology.SQUARE):
         """Initialize a new MinesweeperModel for the specified game board
 
         This creates a game board with the specified dimensions and then randomly hides the specified number of mines.
@@ -85,69 +91,185 @@ class MinesweeperModel:
         :param height: The height (number of rows) of the game board. Default is 9.
         :param n_mines: The number of mines to hide on the game board. There cannot be more mines than there are fields
             on the game board. Default is 10.
+        :param seed: The seed for the random number generator placing the mines. Games created with the same seed and
+            dimensions have the same mine positions. Default is None (a random board).
+        :param topology: The topology of the game board, one of the Topology constants. It defines which fields are
+            adjacent to each other. Default is Topology.SQUARE.
 
-        :raises ValueError: If the number of mines is higher than the number of fields on the game board.
+        :raises ValueError: If the number of mines is negative or higher than the number of fields on the game board, or
+            if the topology is unknown.
         """
         self.width = width
         self.height = height
         self.n_mines = n_mines
+        self.seed = seed
+        self.topology = topology
         self.mines = []
 
+        # The number of uncovered Fields, so won() does not have to scan the whole board
+        self.__n_uncovered = 0
+
         if self.n_mines > self.width * self.height:
             raise ValueError("The number of mines can't be higher than the number of fields on the board")
+        if self.n_mines < 0:
+            raise ValueError("The number of mines can't be negative")
+
+        # The Fields of the game board, row by row: the Field at (x, y) has the index width * y + x
+        self.__fields = [Field() for i in range(self.width * self.height)]
 
-        # Matrix for storing mines
-        # The first value specifies whether there is a mine at the field, the second value specifies the status of the
-        # field: covered, tagged (exclamation mark), in question (question mark) or uncovered
-        self.__board = [[Field() for i in range(self.height)] for j in range(self.width)]
+        # The neighbours of every Field, precomputed for the topology: the indices of the neighbours of the Field with
+        # index i are self.__indices[self.__offsets[i]:self.__offsets[i + 1]]
+        self.__offsets, self.__indices = neighbour_table(self.width, self.height, self.topology)
+
+        # Whether every Field contains a mine and the number of mines adjacent to it, filled in when the mines are
+        # placed
+        self.__mine_flags = bytearray(self.width * self.height)
+        self.__counts = bytearray(self.width * self.height)
+
+        # The difficulty metrics, calculated on first use
+        self.__metrics = None
 
         # Hide the specified number of mines on the board
-        for i in range(n_mines):
+        self.__place_mines(random.Random(seed))
+
+    @timed("model.place_mines")
+    def __place_mines(self, rng: random.Random) -> None:
+        """Randomly hide n_mines mines on the game board and count the mines around every Field
+
+        :param rng: The random number generator choosing the mine positions
+        """
+        for i in range(self.n_mines):
             while True:
                 # Repeat until a spot on the board is found where the mine can be placed
-                x = random.randrange(0, self.width)
-                y = random.randrange(0, self.height)
+                x = rng.randrange(0, self.width)
+                y = rng.randrange(0, self.height)
 
-                if not self.__board[x][y].mine:
-                    self.__board[x][y].mine = True
+                field = self.__fields[self.width * y + x]
+                if not field.mine:
+                    field.mine = True
+                    self.__mine_flags[self.width * y + x] = True
                     self.mines.append((x, y))
                     break
 
+        for x, y in self.mines:
+            index = self.width * y + x
+            for neighbour in self.__indices[self.__offsets[index]:self.__offsets[index + 1]]:
+                self.__counts[neighbour] += 1
+
     def field_state(self, x: int, y: int) -> int:
         """Get the field state of the specified Field on the game board
 
         :param x: The x coordinate (column) of the Field (the leftmost column has the x coordinate 0).
         :param y: The y coordinate (row) of the Field (the uppermost row has the y coordinate 0).
         :return: The field state of the specified Field on the game board
+
+        :raises ValueError: If the coordinates outside of the game board bounds
+        """
+        self.__check_bounds(x, y)
+        return self.__fields[self.width * y + x].state
+
+    def neighbours(self, x: int, y: int) -> list:
+        """Get the coordinates of all Fields adjacent to the specified Field, according to the topology
+
+        :param x: The x coordinate (column) of the Field (the leftmost column has the x coordinate 0).
+        :param y: The y coordinate (row) of the Field (the uppermost row has the y coordinate 0).
+        :return: A list of (x, y) tuples
+
+        :raises ValueError: If the coordinates outside of the game board bounds
         """
-        return self.__board[x][y].state
+        self.__check_bounds(x, y)
+        index = self.width * y + x
+        around = self.__indices[self.__offsets[index]:self.__offsets[index + 1]]
+        return [(i % self.width, i // self.width) for i in around]
 
+    @timed("model.switch_tagging")
     def switch_tagging(self, x: int, y: int) -> int:
         """Switch the field state of the specified Field on the game board
 
         :param x: The x coordinate (column) of the Field (the leftmost column has the x coordinate 0).
         :param y: The y coordinate (row) of the Field (the uppermost row has the y coordinate 0).
         :return: The new field state of the specified Field on the game board
+
+        :raises ValueError: If the coordinates outside of the game board bounds
+        :raises AlreadyUncoveredError: If the Field has been uncovered already
         """
-        return self.__board[x][y].switch_tagging()
+        self.__check_bounds(x, y)
+        return self.__fields[self.width * y + x].switch_tagging()
 
+    @timed("model.uncover")
     def uncover(self, x: int, y: int) -> int:
         """Uncover the specified Field on the game board and return the number of mines on adjacent fields
 
         :param x: The x coordinate (column) of the Field (the leftmost column has the x coordinate 0).
         :param y: The y coordinate (row) of the Field (the uppermost row has the y coordinate 0).
-        :return: The number of mines on the adjacent fields (diagonally adjacent fields are counted as well)
+        :return: The number of mines on the adjacent fields (on a square board, diagonally adjacent fields are counted
+            as well)
 
         :raises ValueError: If the coordinates outside of the game board bounds
         """
-        if x < 0 or x >= self.width:
-            raise ValueError(f"Illegal value for x: {x} with width {self.width}")
-        if y < 0 or y >= self.height:
-            raise ValueError(f"Illegal value for y: {y} with height {self.height}")
+        self.__check_bounds(x, y)
 
-        self.__board[x][y].uncover()
-        return self.__mines_around(x, y)
+        index = self.width * y + x
+        self.__fields[index].uncover()
+        self.__n_uncovered += 1
+        return self.__counts[index]
 
+    def uncover_area(self, x: int, y: int) -> list:
+        """Uncover the specified Field and, if it has no adjacent mines, the whole area of Fields around it
+
+        Starting at the specified Field, every covered, untagged Field adjacent to an uncovered Field with 0 adjacent
+        mines is uncovered as well, just like the player would do by hand.
+
+        :param x: The x coordinate (column) of the Field (the leftmost column has the x coordinate 0).
+        :param y: The y coordinate (row) of the Field (the uppermost row has the y coordinate 0).
+        :return: A list of (x, y, number of adjacent mines) tuples for all Fields that have been uncovered, starting
+            with the specified Field
+
+        :raises ValueError: If the coordinates outside of the game board bounds
+        :raises AlreadyUncoveredError: If the specified Field has been uncovered already
+        :raises FieldTaggedError: If the specified Field is tagged
+        :raises MineFound: If the specified Field contains a mine
+        """
+        uncovered = [(x, y, self.uncover(x, y))]
+        self.__cascade(uncovered)
+        return uncovered
+
+    def chord(self, x: int, y: int) -> list:
+        """Uncover all untagged Fields around an uncovered Field whose mines have all been tagged
+
+        Chording only has an effect if the number of adjacent Fields tagged as MINE_TAGGED equals the number of
+        adjacent mines. Fields uncovered this way cascade like in uncover_area().
+
+        :param x: The x coordinate (column) of the Field (the leftmost column has the x coordinate 0).
+        :param y: The y coordinate (row) of the Field (the uppermost row has the y coordinate 0).
+        :return: A list of (x, y, number of adjacent mines) tuples for all Fields that have been uncovered
+
+        :raises ValueError: If the coordinates outside of the game board bounds
+        :raises MineFound: If one of the Fields around contains a mine (i.e. a Field has been tagged wrongly). The Fields
+            uncovered before the mine was found are in its uncovered attribute.
+        """
+        self.__check_bounds(x, y)
+
+        index = self.width * y + x
+        if self.__fields[index].state != Field.UNCOVERED:
+            return []
+
+        around = self.__indices[self.__offsets[index]:self.__offsets[index + 1]]
+        if sum(1 for i in around if self.__fields[i].state == Field.MINE_TAGGED) != self.__counts[index]:
+            return []
+
+        uncovered = []
+        try:
+            for i in around:
+                if self.__fields[i].state == Field.COVERED:
+                    uncovered.append((i % self.width, i // self.width, self.uncover(i % self.width, i // self.width)))
+        except MineFound as e:
+            e.uncovered = uncovered
+            raise
+        self.__cascade(uncovered)
+        return uncovered
+
+    @timed("model.won")
     def won(self) -> bool:
         """Check whether all empty Fields have been uncovered
 
@@ -155,21 +277,59 @@ class MinesweeperModel:
 
         :return: True if all Fields without a bomb have been uncovered, False otherwise
         """
-        for col in self.__board:
-            for field in col:
-                if field.state != Field.UNCOVERED and not field.mine:
-                    return False
+        return self.__n_uncovered == self.width * self.height - self.n_mines
 
-        return True
+    def metrics(self) -> BoardMetrics:
+        """Get the difficulty metrics of the game board (3BV, openings, isolated numbers and estimated guesses)
 
-    def __mines_around(self, x: int, y: int) -> int:
-        """Calculate the number of mines on adjacent fields.
+        The metrics are calculated on the first call and cached, since the mines never move.
+
+        :return: The BoardMetrics of the game board (see ms_metrics)
+        """
+        if self.__metrics is None:
+            self.__metrics = board_metrics(self.__mine_flags, self.__counts, self.__offsets, self.__indices)
+        return self.__metrics
 
-        Diagonally adjacent fields (e.g. the field in the top left) are also counted towards adjacent fields.
+    def three_bv(self) -> int:
+        """Get the 3BV of the game board, the minimum number of clicks needed to uncover all empty Fields
+
+        Every opening (an area of Fields with 0 adjacent mines, including the numbered Fields around it) takes a single
+        click, and every numbered Field outside of all openings takes another one.
+
+        :return: The 3BV of the game board
+        """
+        return self.metrics().three_bv
+
+    def __cascade(self, uncovered: list) -> None:
+        """Uncover the areas around all Fields with 0 adjacent mines in the list, appending each Field uncovered
+
+        :param uncovered: A list of (x, y, number of adjacent mines) tuples of Fields that have been uncovered. The
+            list is extended in place.
+        """
+        fields, counts, width = self.__fields, self.__counts, self.width
+        offsets, indices = self.__offsets, self.__indices
+
+        i = 0
+        while i < len(uncovered):
+            x, y, n = uncovered[i]
+            i += 1
+            if n > 0:
+                continue
+
+            index = width * y + x
+            for neighbour in indices[offsets[index]:offsets[index + 1]]:
+                field = fields[neighbour]
+                if field.state == Field.COVERED:
+                    # The Field can't contain a mine, since it is adjacent to a Field with 0 adjacent mines
+                    field.state = Field.UNCOVERED
+                    self.__n_uncovered += 1
+                    uncovered.append((neighbour % width, neighbour // width, counts[neighbour]))
+
+    def __check_bounds(self, x: int, y: int) -> None:
+        """Make sure the coordinates are on the game board
 
         :param x: The x coordinate (column) of the Field (the leftmost column has the x coordinate 0).
         :param y: The y coordinate (row) of the Field (the uppermost row has the y coordinate 0).
-        :return: The number of mines on the adjacent fields (diagonally adjacent fields are counted as well)
 
         :raises ValueError: If the coordinates outside of the game board bounds
         """
@@ -177,12 +337,3 @@ class MinesweeperModel:
             raise ValueError(f"Illegal value for x: {x} with width {self.width}")
         if y < 0 or y >= self.height:
             raise ValueError(f"Illegal value for y: {y} with height {self.height}")
-
-        n = 0
-
-        for temp_x in range(max(0, x - 1), min(self.width, x + 2)):
-            for temp_y in range(max(0, y - 1), min(self.height, y + 2)):
-                if self.__board[temp_x][temp_y].mine:
-                    n += 1
-
-        return n
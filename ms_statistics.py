@@ -0,0 +1,138 @@
+"""A local SQLite store for the results of finished games
+
+Finished games are buffered and written in batches, each batch in a single transaction, so simulations can record
+hundreds of thousands of games quickly. An index over the game configuration, the result and the duration lets the
+best times and win rates per configuration be read without scanning the table.
+"""
+
+import os
+import sqlite3
+import time
+
+from ms_topology import Topology
+
+# The default location of the statistics database
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".minesweeper_statistics.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    topology TEXT NOT NULL,
+    seed INTEGER,
+    won INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    clicks INTEGER NOT NULL,
+    three_bv INTEGER NOT NULL
+);
+
+-- Covers both the per-configuration summary and the best times of a configuration
+CREATE INDEX IF NOT EXISTS games_by_config ON games (width, height, mines, topology, won, duration);
+"""
+
+# The query of summary(): the number of games, the number of wins and the best time of every configuration
+SUMMARY_QUERY = """
+SELECT width, height, mines, topology, COUNT(*), SUM(won), MIN(CASE WHEN won THEN duration END)
+FROM games
+GROUP BY width, height, mines, topology
+ORDER BY width, height, mines, topology
+"""
+
+# The query of best_times(): the fastest won games of a configuration
+BEST_TIMES_QUERY = """
+SELECT duration, clicks, three_bv, finished_at
+FROM games
+WHERE width = ? AND height = ? AND mines = ? AND topology = ? AND won = 1
+ORDER BY duration
+LIMIT ?
+"""
+
+COLUMNS = ("finished_at", "width", "height", "mines", "topology", "seed", "won", "duration", "clicks", "three_bv")
+
+
+class StatisticsStore:
+    """A SQLite database of finished games"""
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 1000):
+        """Open (and if necessary create) a statistics database
+
+        :param path: The path of the database file. Default is DEFAULT_PATH (in the home directory).
+        :param batch_size: The number of games to buffer before writing them to the database. Use 1 to write every
+            game immediately. Default is 1000.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.__pending = []
+
+        self.connection = sqlite3.connect(path)
+        # Batches are committed explicitly; WAL makes commits cheap and lets the stats dialog read while a simulation
+        # is writing
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def record(self, width: int, height: int, mines: int, won: bool, duration: float, clicks: int, three_bv: int,
+               seed: int = None, topology: str = Topology.SQUARE) -> None:
+        """Record a finished game. It is written to the database once batch_size games have been recorded.
+
+        :param width: The width (number of columns) of the game board
+        :param height: The height (number of rows) of the game board
+        :param mines: The number of mines on the game board
+        :param won: True if the game has been won, False if it has been lost
+        :param duration: The duration of the game in seconds
+        :param clicks: The number of clicks (or moves) the player made
+        :param three_bv: The 3BV of the game board (see MinesweeperModel.three_bv())
+        :param seed: The seed the mines have been placed with. Default is None (unknown).
+        :param topology: The topology of the game board. Default is Topology.SQUARE.
+        """
+        self.__pending.append((time.time(), width, height, mines, topology, seed, int(won), duration, clicks,
+                               three_bv))
+        if len(self.__pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered games to the database in a single transaction"""
+        if not self.__pending:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO games ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", self.__pending)
+        self.__pending.clear()
+
+    def close(self) -> None:
+        """Write all buffered games and close the database"""
+        self.flush()
+        self.connection.close()
+
+    def summary(self) -> list:
+        """Summarize the games of every configuration
+
+        :return: A list of (width, height, mines, topology, games, wins, best time) tuples, ordered by configuration.
+            The best time is the shortest duration of a won game, or None if no game has been won.
+        """
+        self.flush()
+        return self.connection.execute(SUMMARY_QUERY).fetchall()
+
+    def best_times(self, width: int, height: int, mines: int, topology: str = Topology.SQUARE,
+                   limit: int = 10) -> list:
+        """Get the best times of a configuration
+
+        :param width: The width (number of columns) of the game board
+        :param height: The height (number of rows) of the game board
+        :param mines: The number of mines on the game board
+        :param topology: The topology of the game board. Default is Topology.SQUARE.
+        :param limit: The maximum number of times to return. Default is 10.
+        :return: A list of (duration, clicks, three_bv, finished_at) tuples of won games, the fastest first
+        """
+        self.flush()
+        return self.connection.execute(BEST_TIMES_QUERY, (width, height, mines, topology, limit)).fetchall()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'statistics.ui'
+#
+# Created by: PyQt5 UI code generator 5.11.3
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+class Ui_StatisticsDialog(object):
+    def setupUi(self, StatisticsDialog):
+        StatisticsDialog.setObjectName("StatisticsDialog")
+        StatisticsDialog.resize(560, 320)
+        self.verticalLayout = QtWidgets.QVBoxLayout(StatisticsDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.table = QtWidgets.QTableWidget(StatisticsDialog)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setObjectName("table")
+        self.table.setColumnCount(6)
+        self.table.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.table.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table.setHorizontalHeaderItem(3, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table.setHorizontalHeaderItem(4, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.table.setHorizontalHeaderItem(5, item)
+        self.table.verticalHeader().setVisible(False)
+        self.verticalLayout.addWidget(self.table)
+        self.buttonBox = QtWidgets.QDialogButtonBox(StatisticsDialog)
+        self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
+        self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        self.buttonBox.setObjectName("buttonBox")
+        self.verticalLayout.addWidget(self.buttonBox)
+
+        self.retranslateUi(StatisticsDialog)
+        QtCore.QMetaObject.connectSlotsByName(StatisticsDialog)
+
+    def retranslateUi(self, StatisticsDialog):
+        _translate = QtCore.QCoreApplication.translate
+        StatisticsDialog.setWindowTitle(_translate("StatisticsDialog", "Statistics"))
+        item = self.table.horizontalHeaderItem(0)
+        item.setText(_translate("StatisticsDialog", "Board"))
+        item = self.table.horizontalHeaderItem(1)
+        item.setText(_translate("StatisticsDialog", "Mines"))
+        item = self.table.horizontalHeaderItem(2)
+        item.setText(_translate("StatisticsDialog", "Games"))
+        item = self.table.horizontalHeaderItem(3)
+        item.setText(_translate("StatisticsDialog", "Won"))
+        item = self.table.horizontalHeaderItem(4)
+        item.setText(_translate("StatisticsDialog", "Win rate"))
+        item = self.table.horizontalHeaderItem(5)
+        item.setText(_translate("StatisticsDialog", "Best time"))
+
@@ -0,0 +1,102 @@
+import functools
+from array import array
+
+
+class Topology:
+    """The topologies of the game board, defining which fields are adjacent to each other"""
+
+    SQUARE = "square"  # The classic board: every field has up to 8 neighbours, including the diagonal ones
+    TORUS = "torus"  # Like SQUARE, but the edges wrap around, so every field has exactly 8 neighbours
+    HEXAGONAL = "hexagonal"  # Hexagonal fields with up to 6 neighbours; odd rows are shifted right by half a field
+
+    ALL = (SQUARE, TORUS, HEXAGONAL)
+
+
+# Neighbour offsets (dx, dy) of the square topologies
+SQUARE_OFFSETS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+# Neighbour offsets (dx, dy) of the hexagonal topology, for even and odd rows
+HEXAGONAL_OFFSETS = (
+    ((-1, -1), (0, -1), (-1, 0), (1, 0), (-1, 1), (0, 1)),  # Even rows
+    ((0, -1), (1, -1), (-1, 0), (1, 0), (0, 1), (1, 1)),  # Odd rows
+)
+
+
+def _neighbours(x: int, y: int, width: int, height: int, topology: str) -> list:
+    """Get the indices of the neighbours of a single field, checking the bounds (or wrapping around) for each
+
+    :param x: The x coordinate (column) of the field
+    :param y: The y coordinate (row) of the field
+    :param width: The width (number of columns) of the game board
+    :param height: The height (number of rows) of the game board
+    :param topology: One of the Topology constants
+    :return: The indices (width * y + x) of the neighbours
+    """
+    around = [(x + dx, y + dy) for dx, dy in _offsets(y, topology)]
+
+    if topology == Topology.TORUS:
+        # On small boards, wrapping around can reach the same field twice, or the field itself
+        neighbours = dict.fromkeys(width * (temp_y % height) + temp_x % width for temp_x, temp_y in around)
+        neighbours.pop(width * y + x, None)
+        return list(neighbours)
+
+    return [width * temp_y + temp_x for temp_x, temp_y in around if 0 <= temp_x < width and 0 <= temp_y < height]
+
+
+def _offsets(y: int, topology: str) -> tuple:
+    """Get the neighbour offsets (dx, dy) of the fields in a row
+
+    :param y: The row
+    :param topology: One of the Topology constants
+    :return: A tuple of (dx, dy) tuples
+    """
+    return HEXAGONAL_OFFSETS[y % 2] if topology == Topology.HEXAGONAL else SQUARE_OFFSETS
+
+
+@functools.lru_cache(maxsize=2)
+def neighbour_table(width: int, height: int, topology: str = Topology.SQUARE) -> tuple:
+    """Build the table of neighbours of all fields on a game board
+
+    Fields are numbered row by row (width * y + x). The table is stored like a sparse matrix in CSR format: the
+    neighbours of field i are indices[offsets[i]:offsets[i + 1]]. The two most recently used tables are cached and
+    shared between game boards of the same dimensions, so they must not be modified. No more are kept, since the
+    table of a 1000x1000 board takes about 36 MB.
+
+    :param width: The width (number of columns) of the game board
+    :param height: The height (number of rows) of the game board
+    :param topology: One of the Topology constants. Default is Topology.SQUARE.
+    :return: A tuple (offsets, indices) of two arrays of ints
+
+    :raises ValueError: If the topology is unknown
+    """
+    if topology not in Topology.ALL:
+        raise ValueError(f"Unknown topology: {topology}")
+
+    offsets = array("i", [0])
+    indices = array("i")
+
+    for y in range(height):
+        if 0 < y < height - 1 and width > 2:
+            # Only the first and the last field of an inner row are at the edge. The neighbours of the fields in
+            # between are at the same distances for every field, so they are filled in for the whole row at once.
+            indices.extend(_neighbours(0, y, width, height, topology))
+            offsets.append(len(indices))
+
+            deltas = [width * dy + dx for dx, dy in _offsets(y, topology)]
+            first = width * y + 1
+            n = width - 2
+            row = [0] * (len(deltas) * n)
+            for i, delta in enumerate(deltas):
+                row[i::len(deltas)] = range(first + delta, first + delta + n)
+
+            offsets.extend(range(len(indices) + len(deltas), len(indices) + len(row) + 1, len(deltas)))
+            indices.extend(row)
+
+            indices.extend(_neighbours(width - 1, y, width, height, topology))
+            offsets.append(len(indices))
+        else:
+            for x in range(width):
+                indices.extend(_neighbours(x, y, width, height, topology))
+                offsets.append(len(indices))
+
+    return offsets, indices
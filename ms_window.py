@@ -12,7 +12,7 @@ class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
         MainWindow.setObjectName("MainWindow")
         MainWindow.resize(569, 600)
-        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
         sizePolicy.setHeightForWidth(MainWindow.sizePolicy().hasHeightForWidth())
@@ -24,12 +24,8 @@ class Ui_MainWindow(object):
         sizePolicy.setHeightForWidth(self.centralwidget.sizePolicy().hasHeightForWidth())
         self.centralwidget.setSizePolicy(sizePolicy)
         self.centralwidget.setObjectName("centralwidget")
-        self.verticalLayoutWidget = QtWidgets.QWidget(self.centralwidget)
-        self.verticalLayoutWidget.setGeometry(QtCore.QRect(9, 9, 551, 521))
-        self.verticalLayoutWidget.setObjectName("verticalLayoutWidget")
-        self.main_layout = QtWidgets.QVBoxLayout(self.verticalLayoutWidget)
-        self.main_layout.setSizeConstraint(QtWidgets.QLayout.SetFixedSize)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_layout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.main_layout.setContentsMargins(9, 9, 9, 9)
         self.main_layout.setObjectName("main_layout")
         MainWindow.setCentralWidget(self.centralwidget)
         self.statusbar = QtWidgets.QStatusBar(MainWindow)
@@ -56,11 +52,14 @@ class Ui_MainWindow(object):
         self.new_game_difficult.setObjectName("new_game_difficult")
         self.new_game_custom = QtWidgets.QAction(MainWindow)
         self.new_game_custom.setObjectName("new_game_custom")
+        self.show_statistics = QtWidgets.QAction(MainWindow)
+        self.show_statistics.setObjectName("show_statistics")
         self.new_game.addAction(self.new_game_easy)
         self.new_game.addAction(self.new_game_medium)
         self.new_game.addAction(self.new_game_difficult)
         self.new_game.addAction(self.new_game_custom)
         self.menubar.addAction(self.new_game.menuAction())
+        self.menubar.addAction(self.show_statistics)
 
         self.retranslateUi(MainWindow)
         QtCore.QMetaObject.connectSlotsByName(MainWindow)
@@ -74,4 +73,5 @@ class Ui_MainWindow(object):
         self.new_game_medium.setText(_translate("MainWindow", "Medium (16x16, 40 mines)"))
         self.new_game_difficult.setText(_translate("MainWindow", "Difficult (30x16, 99 mines)"))
         self.new_game_custom.setText(_translate("MainWindow", "Custom"))
+        self.show_statistics.setText(_translate("MainWindow", "Statistics"))
 
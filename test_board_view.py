@@ -0,0 +1,100 @@
+import os
+from unittest import TestCase, skipIf
+
+# The tests don't need a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt5.QtCore import QPoint, QRect
+    from PyQt5.QtWidgets import QApplication
+except ImportError:
+    QApplication = None
+else:
+    from ms_board_view import BoardView
+    from ms_topology import Topology
+
+ZOOMS = [0.1, 0.5, 1.0, 1.3, 3.0]
+
+
+@skipIf(QApplication is None, "PyQt5 is not installed")
+class TestBoardView(TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self) -> None:
+        self.view = BoardView()
+        self.view.resize(300, 200)
+        self.view.show()
+
+    def tearDown(self) -> None:
+        self.view.close()
+
+    def boards(self, topology: str):
+        """Set up a board larger than the viewport at every zoom, scrolled to the origin and to an odd position"""
+        for zoom in ZOOMS:
+            self.view.set_board(40, 30, topology=topology)
+            self.view.set_zoom(zoom)
+            for h_value, v_value in [(0, 0), (37, 23)]:
+                self.view.horizontalScrollBar().setValue(h_value)
+                self.view.verticalScrollBar().setValue(v_value)
+                with self.subTest(zoom=zoom, scroll=(h_value, v_value)):
+                    yield
+
+    def check_field_at(self, topology: str) -> None:
+        """Every pixel of a field should hit the field, and the gaps right of and below it should hit nothing"""
+        view = self.view
+        for _ in self.boards(topology):
+            for y in range(view.rows):
+                for x in range(view.columns):
+                    rect = view.field_rect(x, y)
+                    for point in [rect.topLeft(), rect.bottomRight(), rect.center()]:
+                        self.assertEqual(view.field_at(point), view.columns * y + x)
+
+                    self.assertIsNone(view.field_at(QPoint(rect.right() + 1, rect.center().y())))
+                    self.assertIsNone(view.field_at(QPoint(rect.center().x(), rect.bottom() + 1)))
+
+    def check_field_range(self, topology: str) -> None:
+        """Every field intersecting an area should be in the range of fields painted for it"""
+        view = self.view
+        areas = [QRect(0, 0, 300, 200), QRect(0, 0, 1, 1), QRect(1, 7, 13, 5), QRect(150, 100, 40, 60)]
+        for _ in self.boards(topology):
+            for area in areas:
+                first_column, last_column, first_row, last_row = view.field_range(area)
+                for y in range(view.rows):
+                    for x in range(view.columns):
+                        if view.field_rect(x, y).intersects(area):
+                            self.assertTrue(first_column <= x <= last_column and first_row <= y <= last_row,
+                                            f"({x}, {y}) intersects {area}")
+
+    def test_field_at_square(self):
+        self.check_field_at(Topology.SQUARE)
+
+    def test_field_at_hexagonal(self):
+        self.check_field_at(Topology.HEXAGONAL)
+
+    def test_hexagonal_row_shift(self):
+        """Odd rows of a hexagonal board start half a field to the right, so there is no field left of them"""
+        self.view.set_board(5, 4, topology=Topology.HEXAGONAL)
+        pitch = self.view.pitch()
+
+        self.assertEqual(self.view.field_at(QPoint(1, 1)), 0)
+        self.assertIsNone(self.view.field_at(QPoint(1, pitch + 1)))
+        self.assertEqual(self.view.field_at(QPoint(pitch // 2 + 1, pitch + 1)), 5)
+        # The last field of an odd row reaches half a field further than the last field of an even row
+        self.assertIsNone(self.view.field_at(QPoint(5 * pitch + 1, 1)))
+        self.assertEqual(self.view.field_at(QPoint(5 * pitch + 1, pitch + 1)), 9)
+
+    def test_outside_of_board(self):
+        self.view.set_board(3, 2)
+        pitch = self.view.pitch()
+
+        for point in [QPoint(-1, 1), QPoint(1, -1), QPoint(3 * pitch + 1, 1), QPoint(1, 2 * pitch + 1)]:
+            self.assertIsNone(self.view.field_at(point))
+
+    def test_field_range_square(self):
+        self.check_field_range(Topology.SQUARE)
+
+    def test_field_range_hexagonal(self):
+        self.check_field_range(Topology.HEXAGONAL)
@@ -0,0 +1,114 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+from ms_bot import *
+
+
+class TestBotSession(TestCase):
+
+    def setUp(self) -> None:
+        self.session = BotSession()
+        self.session.handle("new 9 9 10 7")
+        self.mines = self.session.model.mines
+
+    def test_no_game(self):
+        """Moves before the first "new" command should be rejected"""
+        self.assertTrue(BotSession().handle("open 0 0").startswith("err"))
+
+    def test_unknown_command(self):
+        self.assertTrue(self.session.handle("jump 1 2").startswith("err"))
+
+    def test_argument_count(self):
+        self.assertEqual(self.session.handle("open 1"), "err open takes 2 arguments")
+        self.assertEqual(self.session.handle("new 9 9"), "err new takes 3 to 4 arguments")
+        self.assertEqual(self.session.handle("state 1"), "err state takes 0 arguments")
+
+    def test_new_out_of_range(self):
+        """Boards that are empty, too large or have an impossible number of mines should be rejected"""
+        for command in ["new 5 5 -1", "new 0 0 0", "new 0 5 0", f"new {MAX_SIZE + 1} 5 1", "new 100000 100000 1",
+                        "new 5 5 26"]:
+            self.assertTrue(self.session.handle(command).startswith("err"), command)
+
+        # The running game is kept
+        self.assertEqual(self.session.model.mines, self.mines)
+        self.assertEqual(self.session.handle(f"new {MAX_SIZE} 1 0"), "ok")
+
+    def test_out_of_bounds(self):
+        self.assertTrue(self.session.handle("open 9 0").startswith("err"))
+
+    def test_open(self):
+        """Opening a field should list every uncovered field with its number of adjacent mines"""
+        x, y = next((x, y) for x in range(9) for y in range(9) if (x, y) not in self.mines)
+        status, count, *cells = self.session.handle(f"open {x} {y}").split()
+
+        self.assertIn(status, ["ok", "won"])
+        self.assertEqual(int(count), len(cells))
+        self.assertEqual(cells[0].split(",")[:2], [str(x), str(y)])
+
+    def test_open_mine(self):
+        x, y = self.mines[0]
+        self.assertEqual(self.session.handle(f"open {x} {y}"), "lost 0")
+        self.assertTrue(self.session.handle("open 0 0").startswith("err"))
+
+    def test_chord_mine(self):
+        """A chord finding a mine should still list the fields it uncovered before the mine"""
+        # (2, 8) has a single adjacent mine at (1, 8), which comes after (1, 7), (2, 7) and (3, 7) in the neighbours
+        self.session.handle("open 2 8")
+        self.session.handle("flag 3 8")
+        status, count, *cells = self.session.handle("chord 2 8").split()
+
+        self.assertEqual(status, "lost")
+        self.assertEqual(int(count), 3)
+        self.assertEqual(sorted(tuple(cell.split(",")[:2]) for cell in cells), [("1", "7"), ("2", "7"), ("3", "7")])
+        for cell in cells:
+            x, y, n = map(int, cell.split(","))
+            self.assertEqual(self.session.model.field_state(x, y), Field.UNCOVERED)
+
+    def test_flag(self):
+        self.assertEqual(self.session.handle("flag 0 0"), f"ok {Field.MINE_TAGGED}")
+        self.assertEqual(self.session.handle("open 0 0"), "err field tagged")
+
+    def test_state(self):
+        self.session.handle("flag 0 0")
+        status, board = self.session.handle("state").split()
+
+        self.assertEqual(status, "ok")
+        self.assertEqual(board.split("/")[0], "!" + "#" * 8)
+
+    def test_win(self):
+        """Opening every field without a mine should win the game"""
+        responses = self.session.handle_line(";".join(f"open {x} {y}" for x in range(9) for y in range(9)
+                                                      if (x, y) not in self.mines))
+        self.assertTrue(responses[-1].startswith("won") or "won" in [r.split()[0] for r in responses])
+
+    def test_serve(self):
+        """Every command on a line should get its own response line"""
+        stdout = io.StringIO()
+        serve(io.StringIO("new 5 5 1 1; flag 0 0\nstate\nquit\nstate\n"), stdout)
+        self.assertEqual(len(stdout.getvalue().splitlines()), 3)
+
+    def test_serve_quit_in_batch(self):
+        """A "quit" in a batch should stop after answering the commands before it"""
+        stdout = io.StringIO()
+        serve(io.StringIO("new 5 5 1 1; state; quit; state\nstate\n"), stdout)
+        self.assertEqual([line.split()[0] for line in stdout.getvalue().splitlines()], ["ok", "ok"])
+
+    def test_statistics(self):
+        """Finished games should be recorded in the statistics"""
+        with StatisticsStore(os.path.join(tempfile.mkdtemp(), "statistics.sqlite3")) as store:
+            session = BotSession(statistics=store)
+            session.handle("new 9 9 10 7")
+            x, y = self.mines[0]
+            session.handle("flag 0 0")
+            # Rejected moves should not be counted
+            session.handle("open 0 0")
+            session.handle("flag 9 9")
+            session.handle("open 8 8")
+            # (8, 8) has no covered fields around it after opening it, so the chord uncovers nothing
+            session.handle("chord 8 8")
+            session.handle(f"open {x} {y}")
+
+            self.assertEqual(store.summary(), [(9, 9, 10, Topology.SQUARE, 1, 0, None)])
+            self.assertEqual(store.connection.execute("SELECT seed, clicks FROM games").fetchall(), [(7, 3)])
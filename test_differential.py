@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+from ms_differential import *
+
+
+class BrokenModel(MinesweeperModel):
+    """A MinesweeperModel that never tags a Field, to check that the harness detects differences"""
+
+    def switch_tagging(self, x: int, y: int) -> int:
+        return self.field_state(x, y)
+
+
+class UncheckedModel(NaiveModel):
+    """A NaiveModel without bounds checks, wrapping around on negative coordinates and raising an IndexError on others"""
+
+    def field_state(self, x: int, y: int) -> int:
+        return self.board[x][y].state
+
+    def switch_tagging(self, x: int, y: int) -> int:
+        return self.board[x][y].switch_tagging()
+
+
+class ForgetfulModel(NaiveModel):
+    """A NaiveModel that doesn't report the Fields a chord uncovered before finding a mine"""
+
+    def chord(self, x: int, y: int) -> list:
+        try:
+            return super().chord(x, y)
+        except MineFound as e:
+            e.uncovered = ()
+            raise
+
+
+class TestDifferential(TestCase):
+
+    def test_engines_agree(self):
+        """All engines should behave exactly like the reference model on random boards and moves"""
+        for seed in range(100):
+            self.assertEqual(compare(seed), [])
+
+    def test_mismatch_detected(self):
+        mismatches = [m for seed in range(20) for m in compare(seed, engines={"broken": BrokenModel})]
+        self.assertTrue(mismatches)
+        self.assertEqual(mismatches[0].move[0], "switch_tagging")
+
+    def test_out_of_bounds_detected(self):
+        """Engines accepting moves outside of the board should be reported, whatever exception they raise instead"""
+        mismatches = [m for seed in range(100) for m in compare(seed, engines={"unchecked": UncheckedModel})]
+        self.assertTrue(mismatches)
+        for mismatch in mismatches:
+            name, x, y = mismatch.move
+            self.assertIn(name, ["field_state", "switch_tagging"])
+            self.assertFalse(0 <= x < mismatch.width and 0 <= y < mismatch.height)
+        # Beyond the right or bottom edge, the unchecked engine raises an IndexError, which must not crash the harness
+        self.assertIn(("raise", "IndexError", []), [mismatch.actual[0] for mismatch in mismatches])
+
+    def test_random_moves_out_of_bounds(self):
+        """Every kind of move should sometimes be outside of the board"""
+        moves = random_moves(random.Random(0), 5, 5, 5000)
+        outside = {name for name, x, y in moves if not (0 <= x < 5 and 0 <= y < 5)}
+        self.assertEqual(outside, {name for name, weight in MOVES})
+
+    def test_exceptions_recorded(self):
+        """Exceptions should be part of the trace, so engines have to raise the same ones"""
+        moves = [("uncover", x, y) for x, y in MinesweeperModel(width=5, height=5, n_mines=3, seed=1).mines]
+        trace, seconds = play(MinesweeperModel, moves, 5, 5, 3, 1, Topology.SQUARE)
+        self.assertEqual(trace[1][0], ("raise", "MineFound", []))
+        self.assertEqual(len(trace), 2)
+
+    def test_chord_mine_uncovered(self):
+        """The Fields a chord uncovered before finding a mine should be compared as well"""
+        # On this board, (2, 8) has a single adjacent mine at (1, 8), which comes after (1, 7), (2, 7) and (3, 7)
+        moves = [("uncover_area", 2, 8), ("switch_tagging", 3, 8), ("chord", 2, 8)]
+        expected, seconds = play(MinesweeperModel, moves, 9, 9, 10, 7, Topology.SQUARE)
+        self.assertEqual(expected[-1][0], ("raise", "MineFound", [(1, 7, 3), (2, 7, 2), (3, 7, 0)]))
+
+        self.assertEqual(play(NaiveModel, moves, 9, 9, 10, 7, Topology.SQUARE)[0], expected)
+        self.assertNotEqual(play(ForgetfulModel, moves, 9, 9, 10, 7, Topology.SQUARE)[0], expected)
+
+    def test_timings(self):
+        timings = {}
+        compare(0, timings=timings)
+        self.assertEqual(set(timings), {"reference"} | set(ENGINES))
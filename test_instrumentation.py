@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import urllib.request
+from unittest import TestCase
+
+import ms_instrumentation as instrumentation
+from ms_model import MinesweeperModel
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self) -> None:
+        self.was_enabled = instrumentation.registry.enabled
+        instrumentation.registry.reset()
+
+    def tearDown(self) -> None:
+        if self.was_enabled:
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+        instrumentation.registry.reset()
+
+    def test_disabled(self):
+        """Nothing should be recorded while instrumentation is disabled"""
+        instrumentation.disable()
+        MinesweeperModel().won()
+        self.assertEqual(instrumentation.registry.histograms, {})
+
+    def test_disabled_undecorated(self):
+        """Disabled instrumentation should leave the undecorated methods in place, so it doesn't cost anything"""
+        instrumentation.disable()
+        self.assertFalse(hasattr(MinesweeperModel.won, "__wrapped__"))
+
+        instrumentation.enable()
+        self.assertTrue(hasattr(MinesweeperModel.won, "__wrapped__"))
+
+    def test_timed(self):
+        """Calls to decorated model methods should be counted"""
+        instrumentation.enable()
+        model = MinesweeperModel()
+        model.won()
+        model.won()
+
+        self.assertEqual(instrumentation.registry.histograms["model.won"].count, 2)
+        self.assertEqual(instrumentation.registry.histograms["model.place_mines"].count, 1)
+
+    def test_histogram_buckets(self):
+        histogram = instrumentation.Histogram()
+        histogram.observe(0.0)
+        histogram.observe(100.0)
+
+        self.assertEqual(histogram.buckets[0], 1)
+        self.assertEqual(histogram.buckets[-1], 1)
+
+    def test_write_json(self):
+        instrumentation.enable()
+        instrumentation.registry.increment("games")
+
+        path = os.path.join(tempfile.mkdtemp(), "metrics.json")
+        instrumentation.write_json(path)
+        with open(path) as f:
+            self.assertEqual(json.load(f)["counters"], {"games": 1})
+
+    def test_serve(self):
+        """The endpoint should serve the histograms in the Prometheus text format"""
+        instrumentation.enable()
+        with instrumentation.measure("test.block"):
+            pass
+        instrumentation.registry.increment("games")
+
+        server = instrumentation.serve(0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/") as response:
+                text = response.read().decode()
+        finally:
+            server.shutdown()
+
+        self.assertIn('minesweeper_test_block_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn("minesweeper_games_total 1", text)
+        self.assertIn("minesweeper_test_block_seconds_count 1", text)
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from ms_latency import LatencyTracker
+
+
+class TestLatencyTracker(TestCase):
+
+    def setUp(self) -> None:
+        self.tracker = LatencyTracker(window=100)
+
+    def test_no_samples(self):
+        self.assertIsNone(self.tracker.percentiles())
+        self.assertEqual(self.tracker.summary(), "Click to paint: no clicks yet")
+
+    def test_painted_without_input(self):
+        """A paint without a preceding input event should not be measured"""
+        self.assertFalse(self.tracker.painted())
+        self.assertEqual(len(self.tracker.samples["paint"]), 0)
+
+    def test_cancel(self):
+        """A cancelled input event should not be completed by the next paint"""
+        self.tracker.input()
+        self.tracker.cancel()
+        self.assertFalse(self.tracker.pending)
+        self.assertFalse(self.tracker.painted())
+        self.assertEqual(len(self.tracker.samples["paint"]), 0)
+
+    def test_stages(self):
+        """The stages should be recorded in order, and unmarked stages should end with the paint"""
+        self.tracker.input()
+        self.assertTrue(self.tracker.pending)
+        self.tracker.mark("model")
+        self.assertTrue(self.tracker.painted())
+        self.assertFalse(self.tracker.pending)
+
+        model, widgets, paint = (self.tracker.samples[stage][0] for stage in LatencyTracker.STAGES)
+        self.assertLessEqual(model, paint)
+        self.assertEqual(widgets, paint)
+
+    def test_percentiles(self):
+        self.tracker.samples["paint"].extend(i / 1000 for i in range(1, 101))
+        self.assertEqual(self.tracker.percentiles(), (0.05, 0.095, 0.099))
+
+    def test_rolling_window(self):
+        """Only the most recent clicks should be kept"""
+        for i in range(150):
+            self.tracker.input()
+            self.tracker.painted()
+        self.assertEqual(len(self.tracker.samples["paint"]), 100)
+
+    def test_write_json(self):
+        self.tracker.input()
+        self.tracker.painted()
+
+        path = os.path.join(tempfile.mkdtemp(), "latency.json")
+        self.tracker.write_json(path)
+        with open(path) as f:
+            result = json.load(f)
+        self.assertEqual(result["clicks"], 1)
+        self.assertEqual(set(result["paint"]), {"p50", "p95", "p99"})
@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from ms_metrics import *
+from ms_model import MinesweeperModel
+from ms_topology import Topology, neighbour_table
+
+
+def metrics_of(rows: list) -> BoardMetrics:
+    """Calculate the metrics of a square board drawn as strings, "*" being a mine and "." an empty field"""
+    width, height = len(rows[0]), len(rows)
+    offsets, indices = neighbour_table(width, height)
+    mines = bytearray(c == "*" for row in rows for c in row)
+    return board_metrics(mines, mine_counts(mines, offsets, indices), offsets, indices)
+
+
+class TestMetrics(TestCase):
+
+    def test_single_opening(self):
+        """A mine in the center: the outer ring is a single opening including the numbered fields around the mine"""
+        self.assertEqual(metrics_of([".....", ".....", "..*..", ".....", "....."]), BoardMetrics(1, 1, 0, 1))
+
+    def test_isolated_number(self):
+        """The corner next to the mine is only adjacent to numbered fields, so it needs its own click"""
+        self.assertEqual(metrics_of([".....", "*....", ".....", ".....", "....."]), BoardMetrics(2, 1, 1, 1))
+
+    def test_separate_openings(self):
+        """A wall of mines separates the board into two regions with an opening each"""
+        self.assertEqual(metrics_of(["...*...", "...*...", "...*..."]), BoardMetrics(2, 2, 0, 2))
+
+    def test_no_openings(self):
+        self.assertEqual(metrics_of([".*.", ".*.", ".*."]), BoardMetrics(6, 0, 6, 2))
+
+    def test_only_mines(self):
+        self.assertEqual(metrics_of(["**", "**"]), BoardMetrics(0, 0, 0, 0))
+
+    def test_model_metrics(self):
+        """The model should provide the metrics of its board right after generation"""
+        model = MinesweeperModel(width=5, height=5, n_mines=1, seed=28)
+        self.assertEqual(model.mines, [(0, 1)])
+        self.assertEqual(model.metrics(), BoardMetrics(2, 1, 1, 1))
+        self.assertEqual(model.three_bv(), 2)
+
+    def test_batch_metrics(self):
+        """Metrics calculated from stacked mine flags should equal the metrics of the models of the same boards"""
+        for topology in Topology.ALL:
+            models = [MinesweeperModel(width=16, height=12, n_mines=30, seed=seed, topology=topology)
+                      for seed in range(5)]
+            mines = bytearray(16 * 12 * len(models))
+            for b, model in enumerate(models):
+                for x, y in model.mines:
+                    mines[16 * 12 * b + 16 * y + x] = 1
+
+            self.assertEqual(batch_metrics(mines, 16, 12, topology), [model.metrics() for model in models])
+
+    def test_batch_metrics_length(self):
+        with self.assertRaises(ValueError):
+            batch_metrics(bytearray(10), 3, 3)
@@ -85,6 +85,20 @@ class TestModel(TestCase):
         self.model.switch_tagging(x, y)
         self.assertEqual(self.model.field_state(x, y), Field.MINE_TAGGED)
 
+    def test_negative_mines(self):
+        with self.assertRaises(ValueError):
+            MinesweeperModel(width=5, height=5, n_mines=-1)
+
+    def test_out_of_bounds(self):
+        """Coordinates outside of the board should be rejected instead of wrapping around to another field"""
+        for method in [self.model.field_state, self.model.switch_tagging, self.model.uncover, self.model.chord,
+                       self.model.neighbours]:
+            for x, y in [(9, 0), (-1, 0), (0, 9), (0, -1)]:
+                with self.assertRaises(ValueError):
+                    method(x, y)
+
+        self.assertEqual(self.model.field_state(0, 1), Field.COVERED)
+
     def test_uncover_clean(self):
         """After uncovering an untagged, previously covered Field, the state should switch to UNCOVERED"""
 
@@ -129,4 +143,83 @@ class TestModel(TestCase):
                 else:
                     self.model.uncover(x, y)
 
-        self.assertTrue(self.model.won())
\ No newline at end of file
+        self.assertTrue(self.model.won())
+
+    def test_seed(self):
+        """Two games with the same seed should have the same mines"""
+        self.assertEqual(MinesweeperModel(seed=42).mines, MinesweeperModel(seed=42).mines)
+
+    def test_uncover_area(self):
+        """Uncovering a Field without adjacent mines should uncover the whole area around it"""
+        model = MinesweeperModel(width=5, height=5, n_mines=1, seed=1)
+        x, y = next((x, y) for x in range(5) for y in range(5)
+                    if all(abs(x - mx) > 1 or abs(y - my) > 1 for mx, my in model.mines))
+
+        uncovered = model.uncover_area(x, y)
+        self.assertEqual(uncovered[0], (x, y, 0))
+        for field_x, field_y, n in uncovered:
+            if n == 0:
+                for temp_x in range(max(0, field_x - 1), min(5, field_x + 2)):
+                    for temp_y in range(max(0, field_y - 1), min(5, field_y + 2)):
+                        self.assertEqual(model.field_state(temp_x, temp_y), Field.UNCOVERED)
+
+    def test_chord(self):
+        """Chording around a Field with all mines tagged should uncover all other Fields around it"""
+        model = MinesweeperModel(width=3, height=3, n_mines=1, seed=3)
+        mx, my = model.mines[0]
+        x, y = (mx + 1) % 3, my
+
+        model.uncover(x, y)
+        self.assertEqual(model.chord(x, y), [])
+        model.switch_tagging(mx, my)
+
+        uncovered = model.chord(x, y)
+        self.assertNotIn((mx, my), [(u[0], u[1]) for u in uncovered])
+        for field_x, field_y, n in uncovered:
+            self.assertEqual(model.field_state(field_x, field_y), Field.UNCOVERED)
+
+
+class TestTopology(TestCase):
+
+    def test_square_neighbours(self):
+        model = MinesweeperModel(width=4, height=3, n_mines=0)
+        self.assertEqual(len(model.neighbours(0, 0)), 3)
+        self.assertEqual(len(model.neighbours(1, 0)), 5)
+        self.assertEqual(len(model.neighbours(1, 1)), 8)
+
+    def test_torus_neighbours(self):
+        """On a torus, every Field has 8 neighbours, wrapping around the edges"""
+        model = MinesweeperModel(width=4, height=3, n_mines=0, topology=Topology.TORUS)
+        self.assertEqual(sorted(model.neighbours(0, 0)),
+                         [(0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (3, 0), (3, 1), (3, 2)])
+
+    def test_hexagonal_neighbours(self):
+        """Odd rows are shifted to the right, so the neighbours above and below depend on the row"""
+        model = MinesweeperModel(width=4, height=4, n_mines=0, topology=Topology.HEXAGONAL)
+        self.assertEqual(sorted(model.neighbours(1, 2)), [(0, 1), (0, 2), (0, 3), (1, 1), (1, 3), (2, 2)])
+        self.assertEqual(sorted(model.neighbours(1, 1)), [(0, 1), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)])
+
+    def test_unknown_topology(self):
+        with self.assertRaises(ValueError):
+            MinesweeperModel(topology="sphere")
+
+    def test_mines_around(self):
+        """The number of adjacent mines should match the mines among the neighbours in every topology"""
+        for topology in Topology.ALL:
+            model = MinesweeperModel(width=8, height=7, n_mines=15, seed=5, topology=topology)
+            for x in range(8):
+                for y in range(7):
+                    if (x, y) not in model.mines:
+                        expected = sum(1 for neighbour in model.neighbours(x, y) if neighbour in model.mines)
+                        self.assertEqual(model.uncover(x, y), expected)
+            self.assertTrue(model.won())
+
+    def test_three_bv(self):
+        """Every opening and every numbered Field outside of the openings should count as one click"""
+        # A mine in the center: the outer ring is a single opening including the numbered Fields around the mine
+        model = MinesweeperModel(width=5, height=5, n_mines=1, seed=13)
+        self.assertEqual(model.mines, [(2, 2)])
+        self.assertEqual(model.three_bv(), 1)
+
+        self.assertEqual(MinesweeperModel(width=3, height=3, n_mines=0).three_bv(), 1)
+        self.assertEqual(MinesweeperModel(width=3, height=3, n_mines=9).three_bv(), 0)
@@ -0,0 +1,61 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from ms_statistics import *
+
+
+class TestStatisticsStore(TestCase):
+
+    def setUp(self) -> None:
+        self.path = os.path.join(tempfile.mkdtemp(), "statistics.sqlite3")
+        self.store = StatisticsStore(self.path, batch_size=3)
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_batching(self):
+        """Games should only be written once a whole batch has been recorded"""
+        count = "SELECT COUNT(*) FROM games"
+        self.store.record(9, 9, 10, won=True, duration=12.0, clicks=20, three_bv=15)
+        self.store.record(9, 9, 10, won=False, duration=3.0, clicks=2, three_bv=17)
+        self.assertEqual(self.store.connection.execute(count).fetchone()[0], 0)
+
+        self.store.record(9, 9, 10, won=True, duration=9.5, clicks=18, three_bv=12)
+        self.assertEqual(self.store.connection.execute(count).fetchone()[0], 3)
+
+    def test_summary(self):
+        self.store.record(9, 9, 10, won=True, duration=12.0, clicks=20, three_bv=15)
+        self.store.record(9, 9, 10, won=True, duration=9.5, clicks=18, three_bv=12)
+        self.store.record(9, 9, 10, won=False, duration=3.0, clicks=2, three_bv=17)
+        self.store.record(16, 16, 40, won=False, duration=30.0, clicks=25, three_bv=40, topology=Topology.TORUS)
+
+        self.assertEqual(self.store.summary(), [(9, 9, 10, Topology.SQUARE, 3, 2, 9.5),
+                                                (16, 16, 40, Topology.TORUS, 1, 0, None)])
+
+    def test_best_times(self):
+        for duration in [12.0, 9.5, 30.0]:
+            self.store.record(9, 9, 10, won=True, duration=duration, clicks=20, three_bv=15, seed=1)
+        self.store.record(9, 9, 10, won=False, duration=1.0, clicks=1, three_bv=15)
+
+        self.assertEqual([row[0] for row in self.store.best_times(9, 9, 10, limit=2)], [9.5, 12.0])
+
+    def test_persistence(self):
+        """Buffered games should be written when the store is closed"""
+        self.store.record(9, 9, 10, won=True, duration=12.0, clicks=20, three_bv=15)
+        self.store.close()
+
+        with StatisticsStore(self.path) as store:
+            self.assertEqual(store.summary()[0][4], 1)
+
+    def test_index_used(self):
+        """The queries of summary() and best_times() should read the index instead of scanning and sorting the table"""
+        connection = self.store.connection
+        summary_plan = str(connection.execute("EXPLAIN QUERY PLAN " + SUMMARY_QUERY).fetchall())
+        best_times_plan = str(connection.execute("EXPLAIN QUERY PLAN " + BEST_TIMES_QUERY,
+                                                 (9, 9, 10, Topology.SQUARE, 10)).fetchall())
+
+        self.assertIn("COVERING INDEX games_by_config", summary_plan)
+        self.assertIn("USING INDEX games_by_config", best_times_plan)
+        for plan in [summary_plan, best_times_plan]:
+            self.assertNotIn("TEMP B-TREE", plan)